@@ -0,0 +1,155 @@
+"""
+Benchmark of async scraper methods against generated pages served by benchmarks.tipo_server
+in the same process on localhost, no external network is used.
+
+    python -m benchmarks --sizes small normal large --backend lxml
+    python -m benchmarks --save baseline.json
+    python -m benchmarks --compare baseline.json --tolerance 1.25
+    python -m benchmarks --page-cache  # unchanged pages are taken from parsed pages cache
+
+Timings include the local HTTP round trip, peak memory includes allocations of the server.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+from aiohttp.test_utils import TestServer, unused_port
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", nargs="+", default=["small", "normal", "large"])
+    parser.add_argument("--backend", choices=["lxml", "bs4"], default=None)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--save", type=Path, help="Save medians to json file")
+    parser.add_argument("--compare", type=Path, help="Fail if slower than saved medians")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    parser.add_argument(
+        "--page-cache", action="store_true", help="Keep parsed pages, every page is parsed by default"
+    )
+    return parser.parse_args()
+
+
+async def measure(call: Callable[[], Awaitable[Any]], repeat: int) -> Dict[str, float]:
+    await call()  # warm up
+
+    timings: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    await call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "peak_kib": peak / 1024,
+    }
+
+
+async def run(args: argparse.Namespace, port: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+    from tipo_bot.services.async_scraper import AsyncAuth, AsyncSiteEvents
+    from tipo_bot.services.page_cache import PageCache
+
+    from .pages import CLASS_WORKS_PATH, HOME_WORKS_PATH, SIZES, build_site
+    from .tipo_server import TipoServer
+
+    tipo_server = TipoServer(site={})
+    # Host name, aiohttp does not keep cookies of IP addresses
+    server = TestServer(tipo_server.make_app(), host="localhost", port=port)
+    await server.start_server()
+
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    try:
+        for size_name in args.sizes:
+            tipo_server.site = build_site(SIZES[size_name])
+            auth = AsyncAuth()
+            session = await auth.login(username="user", password="password")
+            if session is None:
+                raise RuntimeError(f"Login to stand-in server failed for {size_name} pages")
+
+            cache = PageCache(ttl=3600, maxsize=1000 if args.page_cache else 0)
+            site_events = AsyncSiteEvents(login_session=session, cache=cache, owner="user")
+
+            calls: Dict[str, Callable[[], Awaitable[Any]]] = {
+                "get_csrf_token": auth.get_csrf_token,
+                "get_todays_schedule": site_events.get_todays_schedule,
+                "get_week_schedule": site_events.get_week_schedule,
+                "scrape_subjects": lambda: site_events.scrape_subjects("home"),
+                "scrape_class_works_of_subject": lambda: site_events.scrape_class_works_of_subject(
+                    link=f"{CLASS_WORKS_PATH}/subject?id=0"
+                ),
+                "scrape_home_works_of_subject": lambda: site_events.scrape_home_works_of_subject(
+                    link=f"{HOME_WORKS_PATH}/subject?id=0"
+                ),
+            }
+
+            results[size_name] = {}
+            try:
+                for name, call in calls.items():
+                    if not await call():
+                        raise RuntimeError(f"{name} returned nothing for {size_name} pages")
+                    results[size_name][name] = await measure(call, repeat=args.repeat)
+            finally:
+                await session.close()
+
+            if args.page_cache:
+                print(f"{size_name} page cache: {dict(cache.stats)}")
+    finally:
+        await server.close()
+
+    return results
+
+
+def main() -> int:
+    args = parse_args()
+    port = unused_port()
+    # Read by settings on import
+    os.environ["TIPO_SITE_ROOT"] = f"http://localhost:{port}"
+    if args.backend is not None:
+        os.environ["PARSER_BACKEND"] = args.backend
+
+    results = asyncio.run(run(args, port))
+
+    print(f"{'size':<8} {'method':<32} {'median ms':>10} {'min ms':>10} {'peak KiB':>10}")
+    for size_name, methods in results.items():
+        for name, result in methods.items():
+            print(
+                f"{size_name:<8} {name:<32} {result['median_ms']:>10.2f} "
+                f"{result['min_ms']:>10.2f} {result['peak_kib']:>10.0f}"
+            )
+
+    if args.save is not None:
+        args.save.write_text(json.dumps(results, indent=4))
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())
+        regressions = [
+            f"{size_name} {name}: {result['median_ms']:.2f} ms, "
+            f"baseline {baseline[size_name][name]['median_ms']:.2f} ms"
+            for size_name, methods in results.items()
+            for name, result in methods.items()
+            if name in baseline.get(size_name, {})
+            and result["median_ms"]
+            > baseline[size_name][name]["median_ms"] * args.tolerance
+        ]
+        if regressions:
+            print("Regressions:", *regressions, sep="\n", file=sys.stderr)
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
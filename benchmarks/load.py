@@ -0,0 +1,128 @@
+"""
+Load test of async scraper against benchmarks.tipo_server, reports throughput and tail latency.
+
+    python -m benchmarks.tipo_server --port 8081 --latency 0.2 --jitter 0.1 &
+    python -m benchmarks.load --root http://localhost:8081 --users 200 --concurrency 50 --rounds 3
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--root", default="http://localhost:8081")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20, help="Users at once")
+    parser.add_argument("--rounds", type=int, default=3, help="Operations per user")
+    return parser.parse_args()
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def timed(self, name: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        started = time.perf_counter()
+        try:
+            result = await call()
+        except Exception:
+            self.errors[name] += 1
+            return None
+
+        self.latencies[name].append((time.perf_counter() - started) * 1000)
+        return result
+
+    def report(self, elapsed: float) -> None:
+        total = sum(len(latencies) for latencies in self.latencies.values())
+        print(f"{total} requests in {elapsed:.1f} s, {total / elapsed:.1f} ops/s")
+        print(
+            f"{'operation':<32} {'ok':>6} {'errors':>6} {'p50 ms':>8} "
+            f"{'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+        )
+
+        for name in sorted(set(self.latencies) | set(self.errors)):
+            latencies = sorted(self.latencies[name]) or [0.0]
+            percentiles = (
+                statistics.quantiles(latencies, n=100, method="inclusive")
+                if len(latencies) > 1
+                else latencies * 99
+            )
+            print(
+                f"{name:<32} {len(self.latencies[name]):>6} {self.errors[name]:>6} "
+                f"{percentiles[49]:>8.1f} {percentiles[94]:>8.1f} "
+                f"{percentiles[98]:>8.1f} {latencies[-1]:>8.1f}"
+            )
+
+
+async def run(args: argparse.Namespace) -> None:
+    from tipo_bot.services.async_scraper import AsyncAuth, AsyncSiteEvents
+    from tipo_bot.services.page_cache import page_cache
+
+    from .pages import CLASS_WORKS_PATH, HOME_WORKS_PATH
+
+    stats = Stats()
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def download(site_events: Any, result: Any) -> None:
+        """
+        Stream attached file of home or class work to nowhere
+        """
+        link = result.get("file") if isinstance(result, dict) else None
+        if not link or not link.startswith("http"):
+            return
+
+        async def read() -> int:
+            async with site_events.open_file(link) as stream:
+                return sum([len(chunk) async for chunk in stream.iter_chunked(64 * 1024)])
+
+        await stats.timed("download_file", read)
+
+    async def user_flow(user: int) -> None:
+        async with semaphore:
+            auth = AsyncAuth()
+            session = await stats.timed(
+                "login", lambda: auth.login(username=f"user{user}", password="password")
+            )
+            if session is None:
+                await auth.session.close()
+                return
+
+            site_events = AsyncSiteEvents(login_session=session, owner=f"user{user}")
+            operations: Dict[str, Callable[[], Awaitable[Any]]] = {
+                "get_week_schedule": site_events.get_week_schedule,
+                "scrape_subjects": lambda: site_events.scrape_subjects("home"),
+                "scrape_home_works_of_subject": lambda: site_events.scrape_home_works_of_subject(
+                    link=f"{HOME_WORKS_PATH}/subject?id={user % 3}"
+                ),
+                "scrape_class_works_of_subject": lambda: site_events.scrape_class_works_of_subject(
+                    link=f"{CLASS_WORKS_PATH}/subject?id={user % 3}"
+                ),
+            }
+
+            try:
+                for _ in range(args.rounds):
+                    for name, call in operations.items():
+                        await download(site_events, await stats.timed(name, call))
+            finally:
+                await session.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user_flow(user) for user in range(args.users)))
+    stats.report(time.perf_counter() - started)
+    print(f"page cache: {dict(page_cache.stats)}")
+
+
+def main() -> None:
+    args = parse_args()
+    os.environ["TIPO_SITE_ROOT"] = args.root  # read by settings on import
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Anonymized zhambyltipo.kz pages of configurable size.
+Markup follows recorded pages in tests/fixtures/pages, content is generated.
+"""
+from datetime import date, timedelta
+from typing import Dict, NamedTuple
+
+LOGIN_PATH = "/kk/site/login"
+SCHEDULES_PATH = "/admin/student/schedules"
+HOME_WORKS_PATH = "/admin/student/homeworks"
+CLASS_WORKS_PATH = "/admin/student/classworks"
+
+CSRF_TOKEN = "YmVuY2htYXJrLWNzcmYtdG9rZW4tbm90LWEtc2VjcmV0"
+WEEKDAYS = ("Понедельник", "Вторник", "Среда", "Четверг", "Пятница", "Суббота", "Воскресенье")
+
+
+class PageSize(NamedTuple):
+    lessons: int  # rows of schedules table
+    days: int  # columns of schedules table
+    subjects: int  # subjects in home works and class works lists
+    works: int  # rows of subject's home works and class works tables
+    paragraphs: int  # paragraphs of class work's description
+    file_size: int  # bytes of every attached file
+
+
+SIZES: Dict[str, PageSize] = {
+    "small": PageSize(
+        lessons=2, days=3, subjects=3, works=2, paragraphs=2, file_size=1024
+    ),
+    "normal": PageSize(
+        lessons=6, days=6, subjects=12, works=30, paragraphs=10, file_size=512 * 1024
+    ),
+    "large": PageSize(
+        lessons=12,
+        days=14,
+        subjects=60,
+        works=500,
+        paragraphs=200,
+        file_size=8 * 1024 * 1024,
+    ),
+}
+
+
+def _page(title: str, body: str) -> bytes:
+    return (
+        "<!DOCTYPE html>\n<html lang=\"ru-RU\">\n<head>\n"
+        "<meta charset=\"UTF-8\">\n"
+        f"<meta name=\"csrf-token\" content=\"{CSRF_TOKEN}\">\n"
+        f"<title>{title}</title>\n</head>\n<body>\n"
+        f"<div class=\"content-wrapper\">\n{body}\n</div>\n</body>\n</html>\n"
+    ).encode()
+
+
+def login_page() -> bytes:
+    return _page(
+        "Кіру",
+        '<div class="card"><div class="card-body login-card-body">'
+        f'<form id="login-form" action="{LOGIN_PATH}" method="post">'
+        f'<input type="hidden" name="_csrf" value="{CSRF_TOKEN}">'
+        '<input type="text" name="LoginForm[username]">'
+        '<input type="password" name="LoginForm[password]">'
+        '<button type="submit" name="login-button">Кіру</button>'
+        "</form></div></div>",
+    )
+
+
+def _lesson_cell(lesson: int, day: int) -> str:
+    if (lesson + day) % 4 == 3:
+        return "<td></td>"
+
+    link = ""
+    lesson_format = "Очно"
+    if (lesson + day) % 2 == 0:
+        link = (
+            f'<a href="/admin/student/lesson?id={day * 100 + lesson}" target="_blank">'
+            '<i class="fas fa-video"></i></a>'
+        )
+        lesson_format = "Дистанционное обучение Zoom <small>онлайн</small>"
+
+    return (
+        '<td><div class="schedule-item">'
+        f"{link}"
+        f'<div class="teacher">Преподаватель {lesson + 1}.</div>'
+        f'<div class="subject">Предмет {day}-{lesson}</div>'
+        f'<div class="lecture">{lesson + day}</div>'
+        f'<div class="format">{lesson_format}</div>'
+        "</div></td>"
+    )
+
+
+def schedules_page(size: PageSize, first_day: date) -> bytes:
+    days = [first_day + timedelta(days=day) for day in range(size.days)]
+    head = "".join(
+        f'<th>{WEEKDAYS[day.weekday()]} <br><span class="text-muted">{day.strftime("%d.%m.%Y")}</span></th>'
+        for day in days
+    )
+    rows = "".join(
+        f"<tr><td><b>{lesson + 1}</b> {8 + lesson % 10:02d}:00-{8 + lesson % 10:02d}:35</td>"
+        + "".join(_lesson_cell(lesson, day) for day in range(size.days))
+        + "</tr>"
+        for lesson in range(size.lessons)
+    )
+
+    return _page(
+        "Расписание",
+        '<div class="card"><div class="card-body table-responsive p-0">'
+        '<table id="schedules" class="table table-bordered text-center">'
+        f"<thead><tr><th>#</th>{head}</tr></thead><tbody>{rows}</tbody>"
+        "</table></div></div>",
+    )
+
+
+def subjects_page(size: PageSize, path: str) -> bytes:
+    subjects = "".join(
+        f'<a class="list-group-item list-group-item-action" href="{path}/subject?id={subject}">'
+        f'<h5 class="text-dark">Предмет {subject} <span class="badge badge-info">{subject % 7}</span></h5>'
+        "</a>"
+        for subject in range(size.subjects)
+    )
+
+    return _page(
+        "Предметы",
+        f'<div class="card"><div class="list-group list-group-flush">{subjects}</div></div>',
+    )
+
+
+def class_works_subject_page(size: PageSize) -> bytes:
+    rows = "".join(
+        f'<tr data-key="{7000 + work}"><td>{work + 1}</td><td>Тема {work}</td><td>12.10.2020</td>'
+        f'<td><a href="{CLASS_WORKS_PATH}/view?id={7000 + work}" title="Просмотр">'
+        '<span class="fas fa-eye"></span></a></td></tr>'
+        for work in range(size.works)
+    )
+
+    return _page(
+        "Классные работы",
+        '<div class="card"><div class="card-body table-responsive p-0">'
+        '<table class="table table-hover"><thead><tr><th>#</th><th>Тема</th><th>Дата</th><th></th></tr></thead>'
+        f"<tbody>{rows}</tbody></table></div></div>",
+    )
+
+
+def class_work_view_page(size: PageSize, work: int) -> bytes:
+    paragraphs = "".join(
+        f"<p>Абзац описания {paragraph} классной работы.</p>"
+        for paragraph in range(size.paragraphs)
+    )
+
+    return _page(
+        f"Тема {work}",
+        '<div class="card">'
+        f'<div class="card-body"><h4>Тема {work}</h4></div>'
+        f'<div class="card-body">{paragraphs}</div>'
+        "</div>"
+        '<table id="w0" class="table table-striped table-bordered detail-view">'
+        f"<tr><th>ID</th><td>{work}</td></tr>"
+        "<tr><th>Предмет</th><td>Предмет</td></tr>"
+        "<tr><th>Группа</th><td>ГРУППА-101</td></tr>"
+        "<tr><th>Преподаватель</th><td>Преподаватель А.</td></tr>"
+        f'<tr><th>Материал</th><td><a href="{CLASS_WORKS_PATH}/download?id={work}" '
+        f'download="material_{work}.pdf">material_{work}.pdf</a></td></tr>'
+        "<tr><th>Дата</th><td>12.10.2020</td></tr>"
+        "<tr><th>Создано</th><td>12.10.2020 08:30</td></tr>"
+        "<tr><th>Обновлено</th><td>12.10.2020 08:45</td></tr>"
+        "</table>",
+    )
+
+
+def home_works_subject_page(size: PageSize) -> bytes:
+    rows = []
+    modals = []
+    for work in range(size.works):
+        files = 1 if work % 2 == 0 else 0
+        data_key = 5000 + work
+        rows.append(
+            f'<tr data-key="{data_key}"><td>{work + 1}</td><td>Задание {work}</td>'
+            f"<td>Описание домашнего задания {work}</td><td>20.10.2020 23:59</td>"
+            "<td>Преподаватель А.</td>"
+            f'<td><a href="#" data-toggle="modal" data-target="#modal-files-{data_key}">Файлы ({files})</a></td>'
+            "<td>12.10.2020 10:15</td></tr>"
+        )
+        modal_rows = ""
+        if files:
+            modal_rows = (
+                f"<tr><td>1</td><td>zadanie_{work}.pdf</td>"
+                f'<td><a href="{HOME_WORKS_PATH}/download?id={data_key}">Скачать</a></td></tr>'
+            )
+        modals.append(
+            f'<div id="modal-files-{data_key}" class="modal fade"><div class="modal-dialog">'
+            '<div class="modal-content"><div class="modal-body">'
+            f'<table class="table"><tbody>{modal_rows}</tbody></table>'
+            "</div></div></div></div>"
+        )
+
+    return _page(
+        "Домашние задания",
+        '<div class="card"><div class="card-body table-responsive p-0">'
+        '<table class="table table-hover"><thead><tr><th>#</th><th>Название</th><th>Описание</th>'
+        "<th>Срок сдачи</th><th>Преподаватель</th><th>Файлы</th><th>Создано</th></tr></thead>"
+        f'<tbody>{"".join(rows)}</tbody></table></div></div>{"".join(modals)}',
+    )
+
+
+def build_site(size: PageSize, today: date = None) -> Dict[str, bytes]:
+    """
+    Build every page scraper requests
+    :param size: Size of pages
+    :param today: Today's date, schedule starts from Monday of its week if today fits in size.days
+    :return: Content by path with query string, e.g. /admin/student/classworks/view?id=7000
+    """
+    today = today or date.today()
+    first_day = today - timedelta(days=min(today.weekday(), size.days - 1))
+    attachment = b"%PDF-1.4\n" + b"0" * max(size.file_size - 9, 0)
+
+    site = {
+        LOGIN_PATH: login_page(),
+        SCHEDULES_PATH: schedules_page(size, first_day),
+        HOME_WORKS_PATH: subjects_page(size, HOME_WORKS_PATH),
+        CLASS_WORKS_PATH: subjects_page(size, CLASS_WORKS_PATH),
+    }
+    home_works_subject = home_works_subject_page(size)
+    class_works_subject = class_works_subject_page(size)
+
+    for subject in range(size.subjects):
+        site[f"{HOME_WORKS_PATH}/subject?id={subject}"] = home_works_subject
+        site[f"{CLASS_WORKS_PATH}/subject?id={subject}"] = class_works_subject
+
+    for work in range(size.works):
+        site[f"{CLASS_WORKS_PATH}/view?id={7000 + work}"] = class_work_view_page(
+            size, 7000 + work
+        )
+        site[f"{CLASS_WORKS_PATH}/download?id={7000 + work}"] = attachment
+        site[f"{HOME_WORKS_PATH}/download?id={5000 + work}"] = attachment
+
+    for day in range(size.days):
+        for lesson in range(size.lessons):
+            site[f"/admin/student/lesson?id={day * 100 + lesson}"] = b"<html></html>"
+
+    return site
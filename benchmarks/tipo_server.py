@@ -0,0 +1,125 @@
+"""
+Local stand-in for zhambyltipo.kz serving generated pages, for load and integration tests.
+
+    python -m benchmarks.tipo_server --port 8081 --size normal --latency 0.2 --jitter 0.1 --error-rate 0.01
+    TIPO_SITE_ROOT=http://localhost:8081 python run.py
+
+Use host name in TIPO_SITE_ROOT, aiohttp does not keep cookies of IP addresses.
+Every login succeeds except one with password "wrong".
+"""
+import argparse
+import asyncio
+import logging
+import random
+import secrets
+from typing import Dict, Set
+
+from aiohttp import web
+
+from .pages import CSRF_TOKEN, LOGIN_PATH, SCHEDULES_PATH, SIZES, build_site
+
+logger = logging.getLogger(__name__)
+
+SESSION_COOKIE = "PHPSESSID"
+LOGOUT_PATH = "/site/logout"
+
+
+class TipoServer:
+    def __init__(
+        self,
+        site: Dict[str, bytes],
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+    ) -> None:
+        """
+        :param site: Content by path with query string, see pages.build_site
+        :param latency: Mean delay of every response in seconds
+        :param jitter: Delay is uniformly distributed in latency ± jitter
+        :param error_rate: Share of requests answered with 503
+        """
+        self.site = site
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.sessions: Set[str] = set()
+
+    def make_app(self) -> web.Application:
+        app = web.Application(middlewares=[self.delay_middleware])
+        app.router.add_post(LOGIN_PATH, self.login)
+        app.router.add_post(LOGOUT_PATH, self.logout)
+        app.router.add_get("/{path:.*}", self.page)
+        return app
+
+    @web.middleware
+    async def delay_middleware(self, request: web.Request, handler):
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if random.random() < self.error_rate:
+            raise web.HTTPServiceUnavailable()
+
+        return await handler(request)
+
+    async def login(self, request: web.Request) -> web.StreamResponse:
+        data = await request.post()
+        if data.get("_csrf") != CSRF_TOKEN:
+            raise web.HTTPBadRequest(text="Unable to verify your data submission.")
+
+        if data.get("LoginForm[password]") == "wrong":
+            return web.Response(body=self.site[LOGIN_PATH], content_type="text/html")
+
+        session_id = secrets.token_hex(16)
+        self.sessions.add(session_id)
+
+        response = web.HTTPFound(SCHEDULES_PATH)
+        response.set_cookie(SESSION_COOKIE, session_id)
+        raise response
+
+    async def logout(self, request: web.Request) -> web.StreamResponse:
+        self.sessions.discard(request.cookies.get(SESSION_COOKIE, ""))
+
+        response = web.HTTPFound(LOGIN_PATH)
+        response.del_cookie(SESSION_COOKIE)
+        raise response
+
+    async def page(self, request: web.Request) -> web.StreamResponse:
+        if (
+            request.path.startswith("/admin")
+            and request.cookies.get(SESSION_COOKIE) not in self.sessions
+        ):
+            raise web.HTTPFound(LOGIN_PATH)
+
+        content = self.site.get(request.path_qs)
+        if content is None:
+            raise web.HTTPNotFound()
+
+        if "/download" in request.path:
+            return web.Response(body=content, content_type="application/pdf")
+
+        return web.Response(body=content, content_type="text/html", charset="utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--size", choices=list(SIZES), default="normal")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = TipoServer(
+        site=build_site(SIZES[args.size]),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+    )
+    web.run_app(server.make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
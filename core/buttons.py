@@ -1,6 +1,12 @@
-from typing import List
+import base64
+import hashlib
+from typing import Any, Dict, Hashable, List, Optional, Tuple
 
+from settings import KEYBOARD_CACHE_SIZE, KEYBOARD_CACHE_TTL
+
+from .cache import TTLCache
 from .custom_exceptions import NoCallbackData
+from .resources import command_buttons
 
 from aiogram.types import (  # isort:skip
     InlineKeyboardButton,
@@ -9,8 +15,79 @@ from aiogram.types import (  # isort:skip
     KeyboardButton,
 )
 
+Subjects = List[Dict[str, str]]  # {"subject": "Math", "link": "/admin/..."}
+
+# Callback data of subject buttons is prefix and id of subject, see SubjectRegistry
+CLASS_WORK_PREFIX = "cw:"
+HOME_WORK_PREFIX = "hw:"
+
+
+def subject_id(link: str) -> str:
+    """
+    :return: Short id of subject link, the same in every process
+    """
+    return base64.urlsafe_b64encode(hashlib.sha1(link.encode()).digest()[:6]).decode()
+
+
+class SubjectRegistry:
+    """
+    Subjects by their ids for every user, so callback data carries id instead of link
+    """
+
+    def __init__(
+        self, ttl: float = KEYBOARD_CACHE_TTL, maxsize: int = KEYBOARD_CACHE_SIZE
+    ) -> None:
+        """
+        :param ttl: Seconds subjects of user are kept after they are registered
+        :param maxsize: Max count of users whose subjects are kept
+        """
+        self._subjects: TTLCache[Dict[str, Dict[str, str]]] = TTLCache(
+            ttl=ttl, maxsize=maxsize
+        )
+
+    def register(self, telegram_id: int, subjects: Subjects) -> None:
+        known = self._subjects.get(telegram_id) or {}
+        known.update(
+            (subject_id(subject["link"]), dict(subject)) for subject in subjects
+        )
+        self._subjects.set(telegram_id, known)
+
+    def get(self, telegram_id: int, id_: str) -> Optional[Dict[str, str]]:
+        """
+        :return: Subject or None if it is not registered for user
+        """
+        subject = (self._subjects.get(telegram_id) or {}).get(id_)
+        return dict(subject) if subject is not None else None
+
+
+class FrozenInlineKeyboardMarkup(InlineKeyboardMarkup):
+    """
+    Inline keyboard which is not changed after it is built, so it is converted
+    to JSON serializable object once instead of on every send
+    """
+
+    _python: Optional[Dict[str, Any]] = None
+
+    def to_python(self) -> Dict[str, Any]:
+        if self._python is None:
+            self._python = super().to_python()
+        return self._python
+
 
 class Buttons:
+    def __init__(
+        self, ttl: float = KEYBOARD_CACHE_TTL, maxsize: int = KEYBOARD_CACHE_SIZE
+    ) -> None:
+        """
+        :param ttl: Seconds subject keyboard of user is kept
+        :param maxsize: Max count of kept subject keyboards
+        """
+        self.subjects = SubjectRegistry(ttl=ttl, maxsize=maxsize)
+        # (subjects, keyboard) by (telegram_id, callback prefix)
+        self._subject_keyboards: TTLCache[
+            Tuple[Tuple, InlineKeyboardMarkup]
+        ] = TTLCache(ttl=ttl, maxsize=maxsize)
+
     def init_inline(self, buttons: List[dict], *args, **kwargs) -> InlineKeyboardMarkup:
         """
         Initialize inline buttons by self.buttons variable
@@ -25,7 +102,7 @@ class Buttons:
             )
             for button in buttons
         ]
-        return InlineKeyboardMarkup(*args, **kwargs).add(*inline_buttons)
+        return FrozenInlineKeyboardMarkup(*args, **kwargs).add(*inline_buttons)
 
     def init_cancel_button(self) -> ReplyKeyboardMarkup:
         button_cancel = KeyboardButton(text="Cancel ❌")
@@ -33,3 +110,39 @@ class Buttons:
         kb = ReplyKeyboardMarkup(resize_keyboard=True, one_time_keyboard=True)
         kb.add(button_cancel)
         return kb
+
+    def init_subjects(
+        self, telegram_id: int, subjects: Subjects, callback_prefix: str
+    ) -> InlineKeyboardMarkup:
+        """
+        Keyboard with button of every subject, the same keyboard is returned
+        until subjects of user change. Subjects are registered in self.subjects.
+        :param subjects: Subjects as scraper returns them
+        :param callback_prefix: Callback data of button is prefix and id of subject
+        """
+        self.subjects.register(telegram_id, subjects)
+        key: Hashable = (telegram_id, callback_prefix)
+        fingerprint = tuple(
+            (subject["subject"], subject["link"]) for subject in subjects
+        )
+
+        cached = self._subject_keyboards.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        keyboard = self.init_inline(
+            row_width=2,
+            buttons=[
+                {"name": name, "callback_data": f"{callback_prefix}{subject_id(link)}"}
+                for name, link in fingerprint
+            ],
+        )
+        self._subject_keyboards.set(key, (fingerprint, keyboard))
+        return keyboard
+
+
+buttons_constructor = Buttons()
+
+# Static keyboards, built on import
+command_keyboard = buttons_constructor.init_inline(buttons=command_buttons)
+cancel_keyboard = buttons_constructor.init_cancel_button()
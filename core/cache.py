@@ -0,0 +1,98 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """
+    In-process cache with per entry time to live and LRU eviction
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        maxsize: int,
+        on_evict: Optional[Callable[[V], None]] = None,
+    ) -> None:
+        """
+        :param ttl: Default lifetime of entry in seconds
+        :param maxsize: Max count of entries, least recently used entry is evicted first
+        :param on_evict: Called with value of every expired, evicted or popped entry
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """
+        Get value and mark it as recently used
+        :param key: Key of entry
+        :return: Value or None if entry is missing or expired
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self.pop(key)
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """
+        Set value
+        :param key: Key of entry
+        :param value: Value of entry
+        :param ttl: Lifetime of entry in seconds, self.ttl by default
+        """
+        previous = self._data.pop(key, None)
+        if previous is not None and previous[1] is not value:
+            self._evict(previous[1])
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+
+        while len(self._data) > self.maxsize:
+            _, (_, evicted) = self._data.popitem(last=False)
+            self._evict(evicted)
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        """
+        Remove entry
+        :param key: Key of entry
+        :return: Removed value or None
+        """
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return None
+
+        self._evict(entry[1])
+        return entry[1]
+
+    def values(self) -> List[V]:
+        """
+        Get values of all not expired entries
+        """
+        now = time.monotonic()
+        return [value for expires_at, value in self._data.values() if expires_at > now]
+
+    def clear(self) -> None:
+        while self._data:
+            _, (_, value) = self._data.popitem(last=False)
+            self._evict(value)
+
+    def _evict(self, value: V) -> None:
+        if self.on_evict is not None:
+            self.on_evict(value)
@@ -1,3 +1,8 @@
 class NoCallbackData(Exception):
     def __init__(self, message):
         super().__init__(message)
+
+
+class SessionExpired(Exception):
+    def __init__(self, message):
+        super().__init__(message)
@@ -8,7 +8,13 @@ command_buttons = [
     {"name": "Get schedule", "callback_data": "get_schedule"},
     {"name": "Visit all lessons", "callback_data": "visit_lesson"},
     {"name": "Get home works", "callback_data": "get_home_work"},
+    {"name": "All home works by deadline", "callback_data": "get_all_home_works"},
     {"name": "Get class works", "callback_data": "get_class_work"},
+    {"name": "Auto visit lessons on/off", "callback_data": "toggle_auto_attend"},
+    {
+        "name": "New home works alerts on/off",
+        "callback_data": "toggle_notify_home_works",
+    },
 ]
 account_info = (
     "Name: {name} \nTelegram id: {telegram_id} \nTipo account email: {tipo_email}"
@@ -22,6 +28,9 @@ schedule_text = (
     "Link for subject: {link} \n\n"
 )
 visit_lessons = "Visited lesson: {lesson_name} \nLink: {link}\n\n"
+visit_lessons_failed = (
+    "Failed to visit lesson: {lesson_name} ({error}) \nLink: {link}\n\n"
+)
 hw_desc = (
     "Name: {name} \n\n"
     "Description: {desc} \n\n"
@@ -38,4 +47,12 @@ cw_desc = (
     "Created at: {created_at} \n"
     "Updated at: {updated_at}"
 )
+auto_attend_on = "Lessons will be visited automatically a few minutes after they start"
+auto_attend_off = "Lessons will not be visited automatically anymore"
+notify_home_works_on = "You will get a message when new home work is posted"
+notify_home_works_off = "You will not get messages about new home works anymore"
+new_home_work = "New home work of {subject}: {name} \nDeadline: {deadline}"
+all_hw_item = "{subject}: {name} \nDeadline: {deadline} \nTeacher: {teacher}\n\n"
 no_type_works = "No {type_} works"
+session_expired = "TIPO session has expired, please try again"
+subject_not_found = "Subject is not found, please choose it again"
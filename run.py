@@ -1,17 +1,51 @@
+import argparse
 import json
 import logging.config
 
-from tipo_bot.bot import dp
+from tipo_bot.bot import dp, on_shutdown, on_startup
 
 from aiogram import executor
 
+from settings import BOT_MODE, WORKERS
 
-def setup_logging(path: str = "logging.json") -> None:
+
+def setup_logging(path: str = "logging.json") -> dict:
     with open(path, "rt") as f:
         config = json.load(f)
     logging.config.dictConfig(config)
+    return config
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--mode",
+        choices=["polling", "webhook"],
+        default=BOT_MODE,
+        help="Get updates by long polling or by webhook, see WEBHOOK_* settings",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WORKERS,
+        help="Handle updates in this many processes, user's updates go to one of them",
+    )
+    return parser.parse_args()
 
 
 if __name__ == '__main__':
-    setup_logging()
-    executor.start_polling(dp, skip_updates=True)
+    args = parse_args()
+    logging_config = setup_logging()
+
+    if args.workers > 0:
+        from tipo_bot.workers import start_supervisor
+
+        start_supervisor(args.workers, mode=args.mode, logging_config=logging_config)
+    elif args.mode == "webhook":
+        from tipo_bot.webhook import start_webhook
+
+        start_webhook(dp, on_startup=on_startup, on_shutdown=on_shutdown)
+    else:
+        executor.start_polling(
+            dp, skip_updates=True, on_startup=on_startup, on_shutdown=on_shutdown
+        )
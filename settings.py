@@ -13,3 +13,49 @@ BASE_DIR = Path(__file__).resolve().parent
 
 BOT_API_TOKEN = os.getenv("BOT_API_TOKEN")
 DB_LINK = os.getenv("DB_LINK")
+# Root of zhambyltipo.kz, point it to benchmarks.tipo_server for offline load tests
+TIPO_SITE_ROOT = os.getenv("TIPO_SITE_ROOT", "https://zhambyltipo.kz").rstrip("/")
+
+SESSION_TTL = int(os.getenv("SESSION_TTL", 20 * 60))  # seconds
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", 1000))
+PARSER_BACKEND = os.getenv("PARSER_BACKEND", "lxml")  # lxml or bs4
+LESSON_VISIT_CONCURRENCY = int(os.getenv("LESSON_VISIT_CONCURRENCY", 4))
+LESSON_VISIT_TIMEOUT = float(os.getenv("LESSON_VISIT_TIMEOUT", 10))  # seconds per lesson link
+# Automatic attendance: visits of users sharing lesson start are spread over window
+AUTO_ATTEND_WINDOW = int(os.getenv("AUTO_ATTEND_WINDOW", 5 * 60))  # seconds after lesson start
+AUTO_ATTEND_CONCURRENCY = int(os.getenv("AUTO_ATTEND_CONCURRENCY", 10))  # users at once
+# Home work notifications: poll interval doubles while nothing changes, resets on change
+HOME_WORK_POLL_MIN_INTERVAL = int(os.getenv("HOME_WORK_POLL_MIN_INTERVAL", 10 * 60))  # seconds
+HOME_WORK_POLL_MAX_INTERVAL = int(os.getenv("HOME_WORK_POLL_MAX_INTERVAL", 2 * 60 * 60))  # seconds
+HOME_WORK_POLL_CONCURRENCY = int(os.getenv("HOME_WORK_POLL_CONCURRENCY", 10))  # users at once
+# Parsed pages by hash of their content, see services.page_cache
+PAGE_CACHE_TTL = int(os.getenv("PAGE_CACHE_TTL", 60 * 60))  # seconds
+PAGE_CACHE_SIZE = int(os.getenv("PAGE_CACHE_SIZE", 5000))
+PAGE_CACHE_STATS_INTERVAL = int(os.getenv("PAGE_CACHE_STATS_INTERVAL", 15 * 60))  # seconds
+SUBJECT_SCRAPE_CONCURRENCY = int(os.getenv("SUBJECT_SCRAPE_CONCURRENCY", 4))  # pages at once
+SCRAPE_DEBOUNCE = float(os.getenv("SCRAPE_DEBOUNCE", 3))  # seconds result is shared with repeated taps
+# Database calls run in DB_POOL_SIZE threads, each holding at most one pooled connection
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 5))  # connections for code outside executor
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 10))  # seconds waiting for free connection
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 10 * 60))  # seconds
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 10000))
+# FSM storage: "memory" keeps states in process, "sqlite" in FSM_STORAGE_PATH shared by workers
+FSM_STORAGE = os.getenv("FSM_STORAGE", "memory")
+FSM_STORAGE_PATH = os.getenv("FSM_STORAGE_PATH", str(BASE_DIR / "storage" / "fsm.sqlite3"))
+FSM_STATE_TTL = int(os.getenv("FSM_STATE_TTL", 24 * 60 * 60))  # seconds since last write
+FSM_FLUSH_INTERVAL = float(os.getenv("FSM_FLUSH_INTERVAL", 0.2))  # seconds writes are batched
+# Webhook mode of run.py: Telegram posts updates to WEBHOOK_HOST + WEBHOOK_PATH
+BOT_MODE = os.getenv("BOT_MODE", "polling")  # polling or webhook
+WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "")  # public url, e.g. https://bot.example.com
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/webhook")
+WEBAPP_HOST = os.getenv("WEBAPP_HOST", "0.0.0.0")
+WEBAPP_PORT = int(os.getenv("WEBAPP_PORT", 8080))
+WEBHOOK_MAX_UPDATES = int(os.getenv("WEBHOOK_MAX_UPDATES", 40))  # updates handled at once
+WEBHOOK_DRAIN_TIMEOUT = int(os.getenv("WEBHOOK_DRAIN_TIMEOUT", 30))  # seconds
+# Supervisor mode of run.py: updates are handled by WORKERS processes, 0 runs everything in one
+WORKERS = int(os.getenv("WORKERS", 0))
+WORKER_MAX_UPDATES = int(os.getenv("WORKER_MAX_UPDATES", 40))  # updates handled at once by worker
+# Subject keyboards kept per user until subjects change
+KEYBOARD_CACHE_TTL = int(os.getenv("KEYBOARD_CACHE_TTL", 60 * 60))  # seconds
+KEYBOARD_CACHE_SIZE = int(os.getenv("KEYBOARD_CACHE_SIZE", 10000))
@@ -46,6 +46,24 @@ def test(arg):
     )
 
 
+@invoke.task(
+    help={
+        "sizes": "Page sizes: small, normal, large",
+        "backend": "Parser backend: lxml or bs4",
+        "compare": "Fail if slower than medians saved with --save",
+    }
+)
+def bench(arg, sizes="small normal large", backend="", save="", compare=""):
+    options = f"--sizes {sizes}"
+    if backend:
+        options += f" --backend {backend}"
+    if save:
+        options += f" --save {save}"
+    if compare:
+        options += f" --compare {compare}"
+    arg.run(f"python -m benchmarks {options}", pty=True, echo=True)
+
+
 @invoke.task
 def makemigrations(arg, message):
     arg.run(f"cd {BASE_DIR} && alembic revision --autogenerate -m '{message}'", echo=True, pty=True)
@@ -0,0 +1,34 @@
+from core.buttons import Buttons, command_keyboard, subject_id
+
+
+def test_subject_keyboard_is_kept_until_subjects_change():
+    buttons = Buttons()
+    subjects = [{"subject": "Math", "link": "/admin/1"}, {"subject": "Art", "link": "/admin/2"}]
+
+    keyboard = buttons.init_subjects(telegram_id=1, subjects=subjects, callback_prefix="hw__")
+    assert buttons.init_subjects(1, list(subjects), "hw__") is keyboard
+    assert buttons.init_subjects(2, subjects, "hw__") is not keyboard
+    assert buttons.init_subjects(1, subjects, "cw__") is not keyboard
+
+    changed = buttons.init_subjects(1, subjects[:1], "hw__")
+    assert changed is not keyboard
+    assert changed.to_python() == {
+        "inline_keyboard": [[{"text": "Math", "callback_data": f"hw__{subject_id('/admin/1')}"}]]
+    }
+
+
+def test_subjects_are_found_by_id_of_button():
+    buttons = Buttons()
+    subjects = [{"subject": "Math", "link": "/admin/homework/subject?id=1"}]
+    keyboard = buttons.init_subjects(telegram_id=1, subjects=subjects, callback_prefix="hw:")
+
+    callback_data = keyboard.inline_keyboard[0][0].callback_data
+    assert len(callback_data.encode()) <= 64
+
+    id_ = callback_data[len("hw:"):]
+    assert buttons.subjects.get(1, id_) == subjects[0]
+    assert buttons.subjects.get(2, id_) is None
+
+
+def test_static_keyboard_is_serialized_once():
+    assert command_keyboard.to_python() is command_keyboard.to_python()
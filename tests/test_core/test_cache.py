@@ -0,0 +1,47 @@
+import pytest
+
+from core import cache
+from core.cache import TTLCache
+
+
+@pytest.fixture
+def clock(mocker):
+    now = [1000.0]
+    mocker.patch.object(cache.time, "monotonic", side_effect=lambda: now[0])
+    return now
+
+
+def test_get_returns_value_until_expired(clock):
+    ttl_cache = TTLCache(ttl=10, maxsize=2)
+    ttl_cache.set("key", "value")
+
+    clock[0] += 9
+    assert ttl_cache.get("key") == "value"
+
+    clock[0] += 1
+    assert ttl_cache.get("key") is None
+    assert len(ttl_cache) == 0
+
+
+def test_least_recently_used_is_evicted(clock):
+    evicted = []
+    ttl_cache = TTLCache(ttl=10, maxsize=2, on_evict=evicted.append)
+    ttl_cache.set(1, "first")
+    ttl_cache.set(2, "second")
+    ttl_cache.get(1)
+
+    ttl_cache.set(3, "third")
+
+    assert evicted == ["second"]
+    assert ttl_cache.get(1) == "first"
+    assert ttl_cache.get(3) == "third"
+
+
+def test_set_same_value_does_not_evict(clock):
+    evicted = []
+    ttl_cache = TTLCache(ttl=10, maxsize=2, on_evict=evicted.append)
+    value = object()
+    ttl_cache.set(1, value)
+    ttl_cache.set(1, value)
+
+    assert evicted == []
@@ -0,0 +1,70 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from tipo_bot.background import attendance
+from tipo_bot.background.attendance import AttendanceScheduler
+
+
+def test_users_are_grouped_by_lesson_start(mocker):
+    week = {
+        "12.10.2020": [
+            {"subject": "Math", "time": "09:00-09:35", "link": "math"},
+            {"subject": "History", "time": "09:45-10:20", "link": None},
+            {"subject": "Physics", "time": "10:30-11:05", "link": "physics"},
+        ]
+    }
+    mocker.patch.object(attendance, "get_today_date", return_value="12.10.2020")
+    mocker.patch.object(attendance, "get_site_events", side_effect=_coroutine(object()))
+    mocker.patch.object(attendance, "get_week_schedule", side_effect=_coroutine(week))
+
+    scheduler = AttendanceScheduler(window=300)
+
+    async def plan():
+        await scheduler.add_user(1, {"email": "first", "pwd": ""})
+        await scheduler.add_user(2, {"email": "second", "pwd": ""})
+
+    asyncio.run(plan())
+
+    nine = datetime(2020, 10, 12, 9, 0)
+    assert sorted(scheduler.slots) == [nine, datetime(2020, 10, 12, 10, 30)]
+    assert list(scheduler.slots[nine]) == [1, 2]
+
+    # Slot is due within window after its start, slots with passed window are dropped
+    assert scheduler.pop_due_slots(datetime(2020, 10, 12, 8, 59)) == []
+    due = scheduler.pop_due_slots(datetime(2020, 10, 12, 10, 33))
+    assert [list(visits) for visits in due] == [[1, 2]]
+    assert not scheduler.slots
+
+
+def test_day_and_failed_users_are_planned_again(mocker):
+    user = mocker.Mock(telegram_id=1, credentials={"email": "first", "pwd": ""})
+    load = mocker.patch.object(
+        attendance, "get_flagged_users", side_effect=[ConnectionError(), [user]]
+    )
+
+    scheduler = AttendanceScheduler()
+    add_user = mocker.patch.object(
+        scheduler, "add_user", side_effect=[ConnectionError(), None]
+    )
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(scheduler.plan_day())
+    assert scheduler.date is None  # users are not loaded, day is planned again
+
+    asyncio.run(scheduler.plan_day())
+    assert scheduler.date is not None
+    assert scheduler.unplanned == {1: user.credentials}
+
+    asyncio.run(scheduler.plan_unplanned())
+    assert scheduler.unplanned == {}
+    assert load.call_count == 2
+    assert add_user.call_count == 2
+
+
+def _coroutine(value):
+    async def call(**kwargs):
+        return value
+
+    return call
@@ -0,0 +1,80 @@
+import asyncio
+
+from tipo_bot.background import home_works
+from tipo_bot.background.home_works import HomeWorkPoller
+from tipo_bot.services.async_scraper import AsyncSiteEvents
+
+
+class FakeSiteEvents(AsyncSiteEvents):
+    def __init__(self):
+        super().__init__(login_session=None)
+        self.data_keys = {"/math": "1", "/physics": None}
+
+    async def scrape_subjects(self, type_):
+        return [
+            {"subject": "Math", "link": "/math"},
+            {"subject": "Physics", "link": "/physics"},
+        ]
+
+    async def scrape_home_works_of_subject(self, link):
+        data_key = self.data_keys[link]
+        if data_key is None:
+            return None
+
+        return {"data_key": data_key, "name": f"hw {data_key}", "deadline": "", "file": None}
+
+
+class FakeBot:
+    def __init__(self):
+        self.messages = []
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.messages.append((chat_id, text))
+
+
+def test_user_is_notified_only_about_changes(mocker):
+    site_events = FakeSiteEvents()
+
+    async def get_site_events(**kwargs):
+        return site_events
+
+    mocker.patch.object(home_works, "get_site_events", side_effect=get_site_events)
+    bot = FakeBot()
+    poller = HomeWorkPoller(bot=bot, min_interval=10, max_interval=40)
+
+    async def poll():
+        await poller.add_user(1, {"email": "", "pwd": ""})
+        await poller.poll(1, poller.states[1])
+
+    asyncio.run(poll())  # the first poll only remembers home works
+    assert bot.messages == []
+    assert poller.get_home_work(1, "/math")["data_key"] == "1"
+    assert poller.get_home_work(1, "/physics") is None
+
+    asyncio.run(poller.poll(1, poller.states[1]))
+    assert bot.messages == []
+    assert poller.states[1].interval == 40
+
+    site_events.data_keys["/physics"] = "2"
+    asyncio.run(poller.poll(1, poller.states[1]))
+    assert bot.messages == [(1, "New home work of Physics: hw 2 \nDeadline: ")]
+    assert poller.states[1].interval == 10
+
+
+def test_users_are_loaded_again_after_failure(mocker):
+    user = mocker.Mock(telegram_id=1, credentials={"email": "", "pwd": ""})
+    mocker.patch.object(home_works, "POLL_TICK", 0)
+    mocker.patch.object(
+        home_works, "get_flagged_users", side_effect=[ConnectionError(), [user]]
+    )
+    poller = HomeWorkPoller(bot=FakeBot())
+    mocker.patch.object(poller, "poll")
+
+    async def run():
+        poller.start()
+        while 1 not in poller.states:
+            await asyncio.sleep(0)
+        await poller.stop()
+
+    asyncio.run(asyncio.wait_for(run(), timeout=1))
+    assert poller.states[1].credentials == user.credentials
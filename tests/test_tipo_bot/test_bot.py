@@ -0,0 +1,116 @@
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from aiogram.utils.exceptions import WrongFileIdentifier
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from tipo_bot import bot as bot_module
+from tipo_bot import utils
+from tipo_bot.database.conf import base
+from tipo_bot.database.models import Attachment
+from tipo_bot.database.repository import AttachmentRepository, session_scope
+
+LINK = "https://zhambyltipo.kz/admin/download?id=1"
+
+
+class SiteEvents:
+    def __init__(self, files):
+        self.files = files
+        self.downloads = 0
+
+    @asynccontextmanager
+    async def open_file(self, link):
+        self.downloads += 1
+        content = self.files[link]
+
+        async def iter_chunked(size):
+            for start in range(0, len(content), size):
+                yield content[start : start + size]
+
+        yield SimpleNamespace(iter_chunked=iter_chunked)
+
+
+@pytest.fixture
+def attachments(mocker, tmp_path):
+    # File database, repository is used from threads of run_sync
+    engine = create_engine(f"sqlite:///{tmp_path / 'bot.sqlite3'}")
+    base.metadata.create_all(engine)
+    repository = AttachmentRepository(sessionmaker(bind=engine))
+    mocker.patch.object(utils, "attachments", repository)
+    return repository
+
+
+@pytest.fixture
+def sent(mocker):
+    """
+    Documents sent by bot: file_id of resent ones, content of uploaded ones
+    """
+    sent = []
+
+    async def send_document(chat_id, document):
+        if isinstance(document, str):
+            if document == "rejected":
+                raise WrongFileIdentifier("Wrong file identifier/http url specified")
+            sent.append(document)
+            return None
+
+        filename, chunks = document
+        sent.append(b"".join([chunk async for chunk in chunks]))
+        return SimpleNamespace(
+            document=SimpleNamespace(file_id=f"uploaded-{len(sent)}")
+        )
+
+    mocker.patch.object(bot_module.bot, "send_document", side_effect=send_document)
+    return sent
+
+
+def send(site_events, version):
+    asyncio.run(
+        bot_module.send_attachment(
+            chat_id=1,
+            site_events=site_events,
+            link=LINK,
+            filename="hw.pdf",
+            version=version,
+        )
+    )
+
+
+def test_replaced_file_is_uploaded_again(attachments, sent):
+    site_events = SiteEvents({LINK: b"first"})
+    send(site_events, version="1")
+    send(site_events, version="1")
+    assert sent == [b"first", "uploaded-1"]
+
+    site_events.files[LINK] = b"second"
+    send(site_events, version="2")
+
+    assert sent[-1] == b"second"
+    assert attachments.get_file_id(LINK, "2") == "uploaded-3"
+    assert attachments.get_file_id(LINK, "1") is None
+
+
+def test_new_file_is_downloaded_once(attachments, sent):
+    site_events = SiteEvents({LINK: b"content"})
+
+    send(site_events, version="1")
+
+    assert sent == [b"content"]
+    assert site_events.downloads == 1  # hashed while it is uploaded
+    with session_scope(attachments.factory) as ls:
+        attachment = ls.query(Attachment).filter(Attachment.url == LINK).one()
+        assert attachment.content_hash == hashlib.sha256(b"content").hexdigest()
+        assert attachment.telegram_file_id == "uploaded-1"
+
+
+def test_rejected_file_id_is_forgotten_and_file_uploaded(attachments, sent):
+    attachments.save(url=LINK, content_hash="0" * 64, file_id="rejected", version="1")
+
+    send(SiteEvents({LINK: b"content"}), version="1")
+
+    assert sent == [b"content"]
+    assert attachments.get_file_id(LINK, "1") == "uploaded-1"
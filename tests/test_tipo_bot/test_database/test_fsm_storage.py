@@ -0,0 +1,104 @@
+import asyncio
+import sqlite3
+import time
+
+from tipo_bot.database.fsm_storage import SQLiteStorage
+
+
+def test_state_survives_restart_until_ttl(tmp_path):
+    path = str(tmp_path / "fsm.sqlite3")
+
+    async def first_worker():
+        storage = SQLiteStorage(path=path, ttl=60, flush_interval=0.01)
+        await storage.set_state(chat=1, user=1, state="TipoCredentialsState:credentials")
+        await storage.update_data(chat=1, user=1, data={"email": "a"})
+        assert await storage.get_data(chat=1, user=1) == {"email": "a"}  # before flush
+
+        await asyncio.sleep(0.05)
+        await storage.close()
+        await storage.wait_closed()
+
+    async def second_worker(ttl):
+        storage = SQLiteStorage(path=path, ttl=ttl)
+        state = await storage.get_state(chat=1, user=1)
+        data = await storage.get_data(chat=1, user=1)
+        await storage.close()
+        await storage.wait_closed()
+        return state, data
+
+    asyncio.run(first_worker())
+
+    assert asyncio.run(second_worker(ttl=60)) == (
+        "TipoCredentialsState:credentials",
+        {"email": "a"},
+    )
+    assert asyncio.run(second_worker(ttl=0)) == (None, {})
+
+
+def test_finished_state_is_deleted(tmp_path):
+    storage = SQLiteStorage(path=str(tmp_path / "fsm.sqlite3"))
+
+    async def flow():
+        await storage.set_state(chat=1, user=1, state="state")
+        await storage.flush()
+        await storage.finish(chat=1, user=1)
+        await storage.flush()
+        count = await storage._run(
+            lambda: storage._connect().execute("SELECT COUNT(*) FROM fsm").fetchone()[0]
+        )
+        await storage.close()
+        return count
+
+    assert asyncio.run(flow()) == 0
+
+
+def test_record_written_during_flush_is_flushed(tmp_path):
+    path = str(tmp_path / "fsm.sqlite3")
+
+    async def flow():
+        storage = SQLiteStorage(path=path, flush_interval=0.01)
+        write = storage._write
+
+        def slow_write(records):
+            time.sleep(0.1)
+            write(records)
+
+        storage._write = slow_write
+        await storage.set_data(chat=1, user=1, data={"step": 1})
+        await asyncio.sleep(0.05)  # flush of the first record is running
+        await storage.set_data(chat=1, user=1, data={"step": 2})
+        await asyncio.sleep(0.3)
+
+        other = SQLiteStorage(path=path)
+        data = await other.get_data(chat=1, user=1)
+        await other.close()
+        await storage.close()
+        return data
+
+    assert asyncio.run(flow()) == {"step": 2}
+
+
+def test_failed_flush_is_retried(tmp_path):
+    path = str(tmp_path / "fsm.sqlite3")
+
+    async def flow():
+        storage = SQLiteStorage(path=path, flush_interval=0.01)
+        write = storage._write
+        failures = [sqlite3.OperationalError("database is locked")]
+
+        def flaky_write(records):
+            if failures:
+                raise failures.pop()
+            write(records)
+
+        storage._write = flaky_write
+        await storage.set_state(chat=1, user=1, state="state")
+        await asyncio.sleep(0.1)
+
+        other = SQLiteStorage(path=path)
+        state = await other.get_state(chat=1, user=1)
+        await other.close()
+        await storage.close()
+        return state
+
+    assert asyncio.run(flow()) == "state"
@@ -0,0 +1,49 @@
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from tipo_bot.database.conf import base, run_sync
+from tipo_bot.database.repository import AttachmentRepository, UserRepository
+
+
+@pytest.fixture
+def factory():
+    engine = create_engine("sqlite://")
+    base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def test_get_or_create_user_returns_the_same_row(factory):
+    users = UserRepository(factory)
+
+    created = users.get_or_create(telegram_id=42, first_name="Aigerim")
+    users.update_credentials(telegram_id=42, credentials={"email": "a", "pwd": "b"})
+    fetched = users.get_or_create(telegram_id=42, first_name="Aigerim")
+
+    assert fetched.id == created.id
+    assert fetched.tipo_credentials == '{"email": "a", "pwd": "b"}'  # readable after close
+    assert users.flagged("auto_attend") == []
+
+
+def test_attachment_is_upserted_by_url(factory):
+    attachments = AttachmentRepository(factory)
+
+    attachments.save(url="/file?id=1", content_hash="a", file_id="first")
+    attachments.save(url="/file?id=1", content_hash="b", file_id="second")
+    assert attachments.get_file_id("/file?id=1") == "second"
+
+    attachments.delete("/file?id=1")
+    assert attachments.get_file_id("/file?id=1") is None
+
+
+def test_run_sync_does_not_block_event_loop():
+    def query(argument):
+        return threading.current_thread().name, argument
+
+    thread_name, argument = asyncio.run(run_sync(query, argument=1))
+
+    assert thread_name.startswith("db")
+    assert argument == 1
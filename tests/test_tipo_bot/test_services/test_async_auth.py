@@ -0,0 +1,118 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import aiohttp
+import pytest
+from aiohttp.test_utils import TestServer
+
+from benchmarks.pages import SCHEDULES_PATH, SIZES, build_site
+from benchmarks.tipo_server import TipoServer
+from core.custom_exceptions import SessionExpired
+from tipo_bot import utils
+from tipo_bot.services import async_scraper
+from tipo_bot.services.async_scraper import AsyncAuth, AsyncSiteEvents
+from tipo_bot.services.single_flight import SingleFlight
+from tipo_bot.services.utils import is_login_page
+from tipo_bot.utils import log_in_tipo_account
+
+
+@asynccontextmanager
+async def tipo_site(mocker):
+    """
+    Serve benchmarks.tipo_server on localhost and point scraper to it
+    """
+    tipo_server = TipoServer(site=build_site(SIZES["small"]))
+    # Host name, aiohttp does not keep cookies of IP addresses
+    server = TestServer(tipo_server.make_app(), host="localhost")
+    await server.start_server()
+    mocker.patch.object(async_scraper, "site_prefix", str(server.make_url("")).rstrip("/"))
+    try:
+        yield tipo_server
+    finally:
+        await server.close()
+
+
+def test_login_session_expires(mocker):
+    async def scenario():
+        async with tipo_site(mocker) as tipo_server:
+            session = await AsyncAuth().login(username="user", password="password")
+            assert session is not None
+
+            site_events = AsyncSiteEvents(login_session=session)
+            assert await site_events.get_week_schedule()
+
+            tipo_server.sessions.clear()
+            with pytest.raises(SessionExpired):
+                await site_events.get_week_schedule()
+
+            await session.close()
+
+    asyncio.run(scenario())
+
+
+def test_session_is_closed_if_login_raises(mocker):
+    async def scenario():
+        async with tipo_site(mocker):
+            # Server is stopped right after auth is created
+            auth = AsyncAuth()
+
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await auth.login(username="user", password="password")
+
+        assert auth.session.closed
+
+    asyncio.run(scenario())
+
+
+def test_login_page_is_detected():
+    assert is_login_page("https://zhambyltipo.kz/kk/site/login")
+    assert is_login_page("https://zhambyltipo.kz/kk/site/login?next=%2Fadmin")
+    assert not is_login_page("https://zhambyltipo.kz/admin/student/schedules")
+
+
+def test_landing_page_is_reused(mocker):
+    page = mocker.spy(TipoServer, "page")
+
+    async def scenario():
+        async with tipo_site(mocker):
+            site_events = await log_in_tipo_account(email="user", pwd="password")
+            requested = page.call_count  # redirect to schedules
+
+            assert await site_events.get_week_schedule()
+            assert page.call_count == requested
+
+            await site_events.login_session.close()
+
+    asyncio.run(scenario())
+
+
+def test_changed_week_schedule_is_seen_at_once(mocker):
+    mocker.patch.object(utils, "scrapes", SingleFlight())
+
+    async def scenario():
+        async with tipo_site(mocker) as tipo_server:
+            site_events = await log_in_tipo_account(email="user", pwd="password")
+            first = await utils.get_week_schedule(telegram_id=1, site_events=site_events)
+            assert await utils.get_week_schedule(telegram_id=1, site_events=site_events) == first
+
+            tipo_server.site[SCHEDULES_PATH] = build_site(SIZES["normal"])[SCHEDULES_PATH]
+            changed = await utils.get_week_schedule(telegram_id=1, site_events=site_events)
+
+            await site_events.login_session.close()
+            return first, changed
+
+    first, changed = asyncio.run(scenario())
+
+    assert changed != first
+    assert sum(map(len, changed.values())) > sum(map(len, first.values()))
+
+
+def test_wrong_password_is_reported(mocker):
+    async def scenario():
+        async with tipo_site(mocker):
+            auth = AsyncAuth()
+            assert await auth.login(username="user", password="wrong") is None
+            assert is_login_page(auth.landing_page[0])
+            assert auth.session.closed
+
+    asyncio.run(scenario())
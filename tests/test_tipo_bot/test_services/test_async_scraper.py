@@ -0,0 +1,117 @@
+import asyncio
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from core.custom_exceptions import SessionExpired
+from tipo_bot.services import async_scraper
+from tipo_bot.services.async_scraper import AsyncSiteEvents
+
+
+def test_go_to_lesson_reports_every_link(mocker):
+    mocker.patch.object(async_scraper, "LESSON_VISIT_TIMEOUT", 0.05)
+
+    async def get(url):
+        if url == "slow":
+            await asyncio.sleep(1)
+        if url == "broken":
+            raise aiohttp.ClientConnectionError()
+        return b""
+
+    site_events = AsyncSiteEvents(login_session=None)
+    mocker.patch.object(site_events, "_get", side_effect=get)
+
+    schedule = [
+        {"subject": "Math", "link": "ok"},
+        {"subject": "Physics", "link": "slow"},
+        {"subject": "History", "link": None},
+        {"subject": "Biology", "link": "broken"},
+    ]
+    visits = asyncio.run(site_events.go_to_lesson(schedule=schedule))
+
+    assert [(visit["subject"], visit["visited"], visit["error"]) for visit in visits] == [
+        ("Math", True, None),
+        ("Physics", False, "timeout"),
+        ("Biology", False, "ClientConnectionError"),
+    ]
+
+
+def test_scrape_all_home_works_skips_subjects_without_home_works(mocker):
+    site_events = AsyncSiteEvents(login_session=None)
+
+    async def scrape_subjects(type_):
+        return [{"subject": "Math", "link": "/math"}, {"subject": "Art", "link": "/art"}]
+
+    async def scrape_home_works_of_subject(link):
+        return {"name": "Equations", "deadline": "20.10.2020 23:59"} if link == "/math" else None
+
+    mocker.patch.object(site_events, "scrape_subjects", side_effect=scrape_subjects)
+    mocker.patch.object(
+        site_events, "scrape_home_works_of_subject", side_effect=scrape_home_works_of_subject
+    )
+
+    assert asyncio.run(site_events.scrape_all_home_works()) == [
+        {"name": "Equations", "deadline": "20.10.2020 23:59", "subject": "Math"}
+    ]
+
+
+def test_go_to_lesson_isolates_failure_of_every_link(mocker):
+    async def get(url):
+        if url == "expired":
+            raise SessionExpired("Session expired")
+        if url == "unexpected":
+            raise ValueError("Element is not found")
+        return b""
+
+    site_events = AsyncSiteEvents(login_session=None)
+    mocker.patch.object(site_events, "_get", side_effect=get)
+
+    schedule = [
+        {"subject": "Math", "link": "expired"},
+        {"subject": "Physics", "link": "unexpected"},
+        {"subject": "History", "link": "ok"},
+    ]
+    visits = asyncio.run(site_events.go_to_lesson(schedule=schedule))
+
+    assert [
+        (visit["subject"], visit["visited"], visit["error"]) for visit in visits
+    ] == [
+        ("Math", False, "SessionExpired"),
+        ("Physics", False, "ValueError"),
+        ("History", True, None),
+    ]
+
+
+def test_lesson_link_answering_error_status_is_not_visited():
+    async def lesson(request):
+        return web.Response(text="lesson")
+
+    async def unavailable(request):
+        return web.Response(status=503)
+
+    app = web.Application()
+    app.router.add_get("/lesson", lesson)
+    app.router.add_get("/unavailable", unavailable)
+
+    async def visit():
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            async with aiohttp.ClientSession() as session:
+                site_events = AsyncSiteEvents(login_session=session)
+                return await site_events.go_to_lesson(
+                    schedule=[
+                        {"subject": "Math", "link": str(server.make_url("/lesson"))},
+                        {"subject": "Art", "link": str(server.make_url("/unavailable"))},
+                    ]
+                )
+        finally:
+            await server.close()
+
+    visits = asyncio.run(visit())
+
+    assert [(visit["subject"], visit["visited"], visit["error"]) for visit in visits] == [
+        ("Math", True, None),
+        ("Art", False, "HTTP 503"),
+    ]
@@ -0,0 +1,58 @@
+from tipo_bot.services.page_cache import PageCache
+
+
+def page(csrf: str, body: str) -> bytes:
+    return f'<meta name="csrf-token" content="{csrf}"><p>{body}</p>'.encode()
+
+
+def test_page_differing_only_in_csrf_token_is_not_parsed_again():
+    parsed = []
+
+    def parser(content):
+        parsed.append(content)
+        return {"parsed": len(parsed)}
+
+    page_cache = PageCache(ttl=60, maxsize=10)
+
+    assert page_cache.parse(page("a1", "lesson"), parser) == {"parsed": 1}
+    assert page_cache.parse(page("b2", "lesson"), parser) == {"parsed": 1}
+    assert page_cache.parse(page("c3", "changed"), parser) == {"parsed": 2}
+    assert page_cache.stats == {"misses": 2, "hits": 1}
+
+
+def test_not_modified_page_is_answered_from_cache():
+    page_cache = PageCache(ttl=60, maxsize=10)
+    owner = "student@example.com"
+
+    def parser(content):
+        return ["lesson"]
+
+    assert page_cache.request_headers(owner, "/schedules") == {}
+    page_cache.parse(
+        page("a1", "lesson"),
+        parser,
+        owner=owner,
+        url="/schedules",
+        headers={"ETag": '"v1"'},
+    )
+
+    assert page_cache.request_headers(owner, "/schedules") == {"If-None-Match": '"v1"'}
+    assert page_cache.request_headers("another@example.com", "/schedules") == {}
+    assert page_cache.request_headers(None, "/schedules") == {}
+    assert page_cache.not_modified(owner, "/schedules", parser) == (True, ["lesson"])
+    assert page_cache.stats["not_modified"] == 1
+
+
+def test_stats_are_logged_periodically(mocker, caplog):
+    clock = mocker.patch("tipo_bot.services.page_cache.time.monotonic", return_value=0)
+    page_cache = PageCache(ttl=3600, maxsize=10, stats_interval=60)
+
+    with caplog.at_level("INFO", logger="tipo_bot.services.page_cache"):
+        page_cache.parse(page("a1", "lesson"), list)
+        clock.return_value = 60
+        page_cache.parse(page("b2", "lesson"), list)
+        page_cache.parse(page("c3", "lesson"), list)
+
+    assert [record.getMessage() for record in caplog.records] == [
+        "Page cache | {'misses': 1, 'hits': 1}"
+    ]
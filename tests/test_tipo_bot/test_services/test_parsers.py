@@ -0,0 +1,140 @@
+from pathlib import Path
+
+import pytest
+
+from tipo_bot.services.parsers import BACKENDS, bs4_backend, lxml_backend
+
+PAGES_DIR = Path(__file__).resolve().parents[2] / "fixtures" / "pages"
+
+
+def read_page(name: str) -> bytes:
+    return (PAGES_DIR / name).read_bytes()
+
+
+@pytest.fixture(params=sorted(BACKENDS))
+def backend(request):
+    return BACKENDS[request.param]
+
+
+def test_parse_csrf_token(backend):
+    assert (
+        backend.parse_csrf_token(read_page("login.html"))
+        == "c2VjcmV0LWNzcmYtdG9rZW4tZm9yLXRlc3RzLW9ubHk="
+    )
+
+
+def test_missing_csrf_token_is_none(backend):
+    assert backend.parse_csrf_token(read_page("homeworks.html")) is None
+
+
+def test_parse_todays_schedule(backend):
+    assert backend.parse_todays_schedule(read_page("schedules.html"), "13.10.2020") == [
+        {
+            "time": "09:00-09:35",
+            "name": "Преподаватель Б.",
+            "subject": "История Казахстана",
+            "lecture": "3",
+            "format": "Очно",
+            "link": None,
+        },
+        {
+            "time": "09:45-10:20",
+            "name": "Преподаватель В.",
+            "subject": "Анатомия",
+            "lecture": "7",
+            "format": "Google Meet",
+            "link": "https://zhambyltipo.kz/admin/student/lesson?id=102",
+        },
+    ]
+
+
+def test_parse_todays_schedule_without_todays_column(backend):
+    assert backend.parse_todays_schedule(read_page("schedules.html"), "15.10.2020") is None
+
+
+def test_parse_week_schedule(backend):
+    page = read_page("schedules.html")
+    week = backend.parse_week_schedule(page)
+
+    assert list(week) == ["12.10.2020", "13.10.2020", "14.10.2020"]
+    for date, lessons in week.items():
+        assert lessons == backend.parse_todays_schedule(page, date)
+
+
+def test_parse_subjects(backend):
+    assert backend.parse_subjects(read_page("homeworks.html")) == [
+        {"subject": "Математика", "link": "/admin/student/homeworks/subject?id=11"},
+        {
+            "subject": "История Казахстана",
+            "link": "/admin/student/homeworks/subject?id=12",
+        },
+        {"subject": "Анатомия", "link": "/admin/student/homeworks/subject?id=13"},
+    ]
+
+
+def test_parse_class_works_link(backend):
+    assert (
+        backend.parse_class_works_link(read_page("classworks_subject.html"))
+        == "/admin/student/classworks/view?id=7310"
+    )
+
+
+def test_parse_class_work_info(backend):
+    class_work, download = backend.parse_class_work_info(
+        read_page("classwork_view.html")
+    )
+
+    assert download == ("/admin/student/classworks/download?id=7310", "proizvodnye.pdf")
+    assert class_work == {
+        "type": "file",
+        "file": None,
+        "filename": "proizvodnye.pdf",
+        "desc": "Изучить тему производных.\nОтветить на контрольные вопросы в конце главы.",
+        "id": "7310",
+        "subject": "Математика",
+        "group": "ГРУППА-101",
+        "teacher": "Преподаватель А.",
+        "date": "12.10.2020",
+        "created_at": "12.10.2020 08:30",
+        "updated_at": "12.10.2020 08:45",
+    }
+
+
+def test_parse_home_work(backend):
+    home_work, link, filename = backend.parse_home_work(
+        read_page("homeworks_subject.html")
+    )
+
+    assert link == "https://zhambyltipo.kz/admin/student/homeworks/download?id=9001"
+    assert filename == "Решить задачи 1.pdf"
+    assert home_work == {
+        "data_key": "5021",
+        "name": "Производные",
+        "desc": "Решить задачи 1-10 из сборника",
+        "deadline": "20.10.2020 23:59",
+        "teacher": "Преподаватель А.",
+        "file": None,
+        "filename": "Решить задачи 1.pdf",
+        "created_at": "12.10.2020 10:15",
+    }
+
+
+@pytest.mark.parametrize(
+    "parser, page, args",
+    [
+        ("parse_csrf_token", "login.html", ()),
+        ("parse_csrf_token", "homeworks.html", ()),  # no csrf meta tag
+        ("parse_todays_schedule", "schedules.html", ("12.10.2020",)),
+        ("parse_week_schedule", "schedules.html", ()),
+        ("parse_subjects", "homeworks.html", ()),
+        ("parse_class_works_link", "classworks_subject.html", ()),
+        ("parse_class_work_info", "classwork_view.html", ()),
+        ("parse_home_work", "homeworks_subject.html", ()),
+    ],
+)
+def test_backends_parity(parser, page, args):
+    content = read_page(page)
+
+    assert getattr(lxml_backend, parser)(content, *args) == getattr(
+        bs4_backend, parser
+    )(content, *args)
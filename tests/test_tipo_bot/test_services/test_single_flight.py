@@ -0,0 +1,28 @@
+import asyncio
+
+from tipo_bot.services.single_flight import SingleFlight
+
+
+def test_concurrent_and_debounced_calls_share_result():
+    calls = []
+
+    async def scrape(argument):
+        calls.append(argument)
+        await asyncio.sleep(0.01)
+        return [argument]
+
+    async def taps():
+        single_flight = SingleFlight(debounce=60)
+        results = await asyncio.gather(
+            single_flight.do((1, "subjects", "home"), lambda: scrape("home")),
+            single_flight.do((1, "subjects", "home"), lambda: scrape("home")),
+            single_flight.do((1, "subjects", "class"), lambda: scrape("class")),
+        )
+        late = await single_flight.do((1, "subjects", "home"), lambda: scrape("home"))
+        return results, late
+
+    results, late = asyncio.run(taps())
+
+    assert results == [["home"], ["home"], ["class"]]
+    assert late == ["home"]
+    assert calls == ["home", "class"]
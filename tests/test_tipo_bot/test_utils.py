@@ -1,6 +1,66 @@
+import asyncio
+
 import pytest
 
 from tipo_bot import utils
 
 
-# TODO: Write tests
+@pytest.mark.parametrize(
+    "parts, messages",
+    [
+        (["ab", "cd", "e"], ["abcd", "e"]),
+        (["abcdef", "g"], ["abcd", "ef", "g"]),
+        ([], [""]),
+    ],
+)
+def test_split_message(parts, messages):
+    assert utils.split_message(parts, limit=4) == messages
+
+
+def test_user_is_read_from_database_once_until_credentials_change(mocker):
+    row = mocker.Mock(
+        id=1,
+        telegram_id=42,
+        first_name="Aigerim",
+        tipo_credentials='{"email": "a", "pwd": "b"}',
+        auto_attend=False,
+        notify_home_works=False,
+    )
+    get_or_create = mocker.patch.object(utils.users, "get_or_create", return_value=row)
+    mocker.patch.object(utils.users, "update_credentials")
+    utils.user_cache.clear()
+
+    async def clicks():
+        first = await utils.get_or_create_user(telegram_id=42, first_name="Aigerim")
+        second = await utils.get_or_create_user(telegram_id=42, first_name="Aigerim")
+        await utils.update_users_tipo_creds(42, {"email": "c", "pwd": "d"})
+        await utils.get_or_create_user(telegram_id=42, first_name="Aigerim")
+        return first, second
+
+    first, second = asyncio.run(clicks())
+
+    assert first is second
+    assert first.credentials == {"email": "a", "pwd": "b"}
+    assert get_or_create.call_count == 2
+
+
+def test_expired_session_is_dropped_after_lesson_visits(mocker):
+    invalidate = mocker.patch.object(utils.tipo_sessions, "invalidate")
+    site_events = mocker.Mock()
+    visits = [
+        {"subject": "Math", "visited": True, "error": None},
+        {"subject": "Physics", "visited": False, "error": "SessionExpired"},
+    ]
+
+    async def go_to_lesson(schedule):
+        return visits
+
+    site_events.go_to_lesson = go_to_lesson
+
+    assert asyncio.run(utils.visit_lessons(42, site_events)) == visits
+    invalidate.assert_called_once_with(42)
+
+    invalidate.reset_mock()
+    visits.pop()
+    asyncio.run(utils.visit_lessons(42, site_events))
+    invalidate.assert_not_called()
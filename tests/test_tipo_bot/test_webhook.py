@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from tipo_bot.webhook import UpdateLimiter
+
+
+def test_updates_are_limited_and_drained():
+    limiter = UpdateLimiter(limit=2)
+    running = []
+    peak = []
+
+    async def handler(request):
+        running.append(request)
+        peak.append(len(running))
+        await asyncio.sleep(0.02)
+        running.remove(request)
+        return web.Response(text="ok")
+
+    async def serve():
+        updates = [asyncio.ensure_future(limiter.middleware(n, handler)) for n in range(5)]
+        await asyncio.sleep(0)
+        await limiter.drain(timeout=1)
+
+        assert all(update.done() for update in updates)
+        with pytest.raises(web.HTTPServiceUnavailable):
+            await limiter.middleware(5, handler)
+
+    asyncio.run(serve())
+
+    assert max(peak) == 2
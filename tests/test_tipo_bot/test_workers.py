@@ -0,0 +1,45 @@
+import asyncio
+import queue
+
+from tipo_bot.workers import STOP, UpdateRouter, handle_updates
+
+
+def message(update_id, user_id):
+    return {
+        "update_id": update_id,
+        "message": {"message_id": update_id, "from": {"id": user_id}, "chat": {"id": user_id}},
+    }
+
+
+def test_updates_are_routed_by_user():
+    queues = [queue.Queue() for _ in range(3)]
+    router = UpdateRouter(queues)
+
+    for update_id, user_id in enumerate([7, 8, 7, 9]):
+        router.put(message(update_id, user_id))
+    router.put({"update_id": 4, "poll": {"id": "1"}})
+
+    assert [queues[1].get()["update_id"], queues[1].get()["update_id"]] == [0, 2]
+    assert queues[2].get()["update_id"] == 1
+    assert queues[0].get()["update_id"] == 3
+    assert queues[0].get()["update_id"] == 4
+
+
+def test_updates_of_user_are_handled_in_order():
+    handled = []
+
+    class Dispatcher:
+        async def process_update(self, update):
+            # Earlier updates of user take longer
+            await asyncio.sleep(0.05 / update.update_id)
+            handled.append((update.message.from_user.id, update.update_id))
+
+    updates = queue.Queue()
+    for update_id, user_id in enumerate([1, 2, 1, 2, 1], start=1):
+        updates.put(message(update_id, user_id))
+    updates.put(STOP)
+
+    asyncio.run(handle_updates(Dispatcher(), updates))
+
+    assert [update_id for user_id, update_id in handled if user_id == 1] == [1, 3, 5]
+    assert [update_id for user_id, update_id in handled if user_id == 2] == [2, 4]
@@ -0,0 +1,4 @@
+from .attendance import AttendanceScheduler
+from .home_works import HomeWorkPoller
+
+__all__ = ["AttendanceScheduler", "HomeWorkPoller"]
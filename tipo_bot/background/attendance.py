@@ -0,0 +1,246 @@
+"""
+Automatic lesson attendance of users who opted in
+"""
+import asyncio
+import logging
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import DefaultDict, Dict, List, Optional, Set
+
+from core.custom_exceptions import SessionExpired
+from settings import AUTO_ATTEND_CONCURRENCY, AUTO_ATTEND_WINDOW
+
+from ..services.utils import get_today_date
+from ..sharding import is_local
+
+from ..utils import (  # isort:skip
+    get_flagged_users,
+    get_site_events,
+    get_week_schedule,
+    tipo_sessions,
+    visit_lessons,
+)
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 60  # seconds, longest sleep between checks of slots and day rollover
+
+Lessons = List[Dict[str, str]]
+
+
+def lesson_start(date: str, time: str) -> datetime:
+    """
+    :param date: Date in format dd.mm.YYYY
+    :param time: Lesson's "time" field, e.g. "09:00-09:35"
+    :return: Start of lesson
+    """
+    return datetime.strptime(f"{date} {time.split('-')[0].strip()}", "%d.%m.%Y %H:%M")
+
+
+class AttendanceScheduler:
+    """
+    Visits links of today's lessons of opted in users when lessons start.
+    Users are grouped by lesson start slot, visits of a slot are spread over window
+    with random jitter and at most concurrency users are visiting at once.
+    """
+
+    def __init__(
+        self,
+        window: int = AUTO_ATTEND_WINDOW,
+        concurrency: int = AUTO_ATTEND_CONCURRENCY,
+    ) -> None:
+        """
+        :param window: Seconds after lesson start, within which lesson is visited
+        :param concurrency: Max count of users logging in or visiting lessons at once
+        """
+        self.window = window
+        self.concurrency = concurrency
+        self.date: Optional[str] = None
+        # Lessons of every user by start of lesson
+        self.slots: DefaultDict[datetime, Dict[int, Lessons]] = defaultdict(dict)
+        self.credentials: Dict[int, Dict[str, str]] = {}
+        # Credentials of users whose planning failed, retried on the next check
+        self.unplanned: Dict[int, Dict[str, str]] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Future] = None
+        self._visits: Set[asyncio.Future] = set()
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:  # created in running loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    def start(self) -> None:
+        self._task = asyncio.ensure_future(self.run())
+
+    async def stop(self) -> None:
+        for task in [self._task, *self._visits]:
+            if task is not None:
+                task.cancel()
+
+        await asyncio.gather(
+            *[task for task in [self._task, *self._visits] if task is not None],
+            return_exceptions=True,
+        )
+
+    async def add_user(self, telegram_id: int, credentials: Dict[str, str]) -> None:
+        """
+        Plan visits of user's today's lessons
+        :param telegram_id: User's telegram id
+        :param credentials: {"email": ..., "pwd": ...}
+        """
+        self.remove_user(telegram_id)
+
+        site_events = await get_site_events(
+            telegram_id=telegram_id, credentials=credentials
+        )
+        if site_events is None:
+            logger.warning(f"Auto attendance of {telegram_id} skipped, login failed")
+            return
+
+        today = get_today_date()
+        week = await get_week_schedule(telegram_id=telegram_id, site_events=site_events)
+
+        for lesson in week.get(today) or []:
+            if lesson["link"] is not None:
+                start = lesson_start(today, lesson["time"])
+                self.slots[start].setdefault(telegram_id, []).append(lesson)
+
+        self.credentials[telegram_id] = dict(credentials)
+
+    def remove_user(self, telegram_id: int) -> None:
+        for visits in self.slots.values():
+            visits.pop(telegram_id, None)
+
+        self.credentials.pop(telegram_id, None)
+        self.unplanned.pop(telegram_id, None)
+
+    async def plan_day(self) -> None:
+        """
+        Plan today's visits of every opted in user. Day is planned again on the next
+        check if users are not loaded, users whose planning failed are retried.
+        """
+        today = get_today_date()
+        users = await get_flagged_users("auto_attend")
+
+        self.slots.clear()
+        self.credentials.clear()
+        self.unplanned = {
+            user.telegram_id: user.credentials
+            for user in users
+            if is_local(user.telegram_id) and user.credentials is not None
+        }
+        logger.info(f"Planning auto attendance of {len(self.unplanned)} users")
+        self.date = today
+        await self.plan_unplanned()
+
+    async def plan_unplanned(self) -> None:
+        """
+        Plan visits of users whose planning has not succeeded yet
+        """
+        pending, self.unplanned = self.unplanned, {}
+
+        async def add(telegram_id: int, credentials: Dict[str, str]) -> None:
+            async with self.semaphore:
+                try:
+                    await self.add_user(telegram_id, credentials)
+                except Exception:
+                    logger.exception(f"Auto attendance of {telegram_id} is not planned")
+                    self.unplanned[telegram_id] = credentials
+
+        await asyncio.gather(
+            *(
+                add(telegram_id, credentials)
+                for telegram_id, credentials in pending.items()
+            )
+        )
+
+    def pop_due_slots(self, now: datetime) -> List[Dict[int, Lessons]]:
+        """
+        Take slots which have started, slots whose window has passed are dropped
+        (e.g. lessons before restart of the bot)
+        """
+        due = []
+
+        for start in sorted(self.slots):
+            if start > now:
+                break
+
+            visits = self.slots.pop(start)
+            if start + timedelta(seconds=self.window) >= now:
+                due.append(visits)
+
+        return due
+
+    async def run(self) -> None:
+        while True:
+            try:
+                if self.date != get_today_date():
+                    await self.plan_day()
+                elif self.unplanned:
+                    await self.plan_unplanned()
+
+                now = datetime.today()
+                for visits in self.pop_due_slots(now):
+                    task = asyncio.ensure_future(self.attend_slot(visits))
+                    self._visits.add(task)
+                    task.add_done_callback(self._visits.discard)
+
+                upcoming = min(self.slots, default=None)
+                delay: float = POLL_INTERVAL
+                if upcoming is not None:
+                    delay = min(delay, (upcoming - now).total_seconds())
+            except Exception:
+                logger.exception("Auto attendance scheduler failed")
+                delay = POLL_INTERVAL
+
+            await asyncio.sleep(max(delay, 0))
+
+    async def attend_slot(self, visits: Dict[int, Lessons]) -> None:
+        await asyncio.gather(
+            *(
+                self.attend(telegram_id, lessons, delay=random.uniform(0, self.window))
+                for telegram_id, lessons in visits.items()
+            )
+        )
+
+    async def attend(self, telegram_id: int, lessons: Lessons, delay: float) -> None:
+        """
+        Visit lessons of user after delay
+        """
+        await asyncio.sleep(delay)
+
+        async with self.semaphore:
+            credentials = self.credentials.get(telegram_id)
+            if credentials is None:  # opted out meanwhile
+                return
+
+            try:
+                site_events = await get_site_events(
+                    telegram_id=telegram_id, credentials=credentials
+                )
+                if site_events is None:
+                    logger.warning(
+                        f"Auto attendance of {telegram_id} failed, login failed"
+                    )
+                    return
+
+                visited_lessons = await visit_lessons(
+                    telegram_id=telegram_id, site_events=site_events, schedule=lessons
+                )
+            except SessionExpired:
+                tipo_sessions.invalidate(telegram_id)
+                logger.warning(
+                    f"Auto attendance of {telegram_id} failed, session expired"
+                )
+                return
+            except Exception:
+                logger.exception(f"Auto attendance of {telegram_id} failed")
+                return
+
+        logger.info(
+            f"Auto attendance of {telegram_id} | "
+            f"{sum(1 for lesson in visited_lessons if lesson['visited'])}/{len(lessons)}"
+        )
@@ -0,0 +1,273 @@
+"""
+Polling of home works of users who opted in notifications about new ones
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, List, Optional, Set
+
+from aiogram import Bot
+
+import core.resources as dialog
+from core.custom_exceptions import SessionExpired
+
+from ..sharding import is_local
+from ..utils import get_flagged_users, get_site_events, tipo_sessions
+
+from settings import (  # isort:skip
+    HOME_WORK_POLL_CONCURRENCY,
+    HOME_WORK_POLL_MAX_INTERVAL,
+    HOME_WORK_POLL_MIN_INTERVAL,
+)
+
+
+logger = logging.getLogger(__name__)
+
+POLL_TICK = 10  # seconds, longest sleep between checks of due users
+
+HomeWork = Dict[str, Optional[str]]
+
+
+class HomeWorkState:
+    """
+    The latest home works of user seen by poller
+    """
+
+    def __init__(self, credentials: Dict[str, str], interval: float) -> None:
+        self.credentials = credentials
+        self.interval = interval
+        # Spread first polls of users planned at once
+        self.next_poll = time.monotonic() + random.uniform(0, interval)
+        self.polling = False
+        # None until the first poll
+        self.subjects: Optional[List[Dict[str, str]]] = None
+        self.home_works: Dict[str, Optional[HomeWork]] = {}  # by subject's link
+
+
+class HomeWorkPoller:
+    """
+    Polls subjects of every opted in user and the latest home work of each subject,
+    user gets a message when data_key of subject's latest home work changes.
+    Poll interval of user doubles up to max_interval while nothing changes
+    and drops to min_interval after a change.
+    Interactive requests of polled users are served from the polled state.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        min_interval: int = HOME_WORK_POLL_MIN_INTERVAL,
+        max_interval: int = HOME_WORK_POLL_MAX_INTERVAL,
+        concurrency: int = HOME_WORK_POLL_CONCURRENCY,
+    ) -> None:
+        """
+        :param bot: Bot sending notifications
+        :param min_interval: Seconds between polls of user after change
+        :param max_interval: Longest seconds between polls of user
+        :param concurrency: Max count of users polled at once
+        """
+        self.bot = bot
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.concurrency = concurrency
+        self.states: Dict[int, HomeWorkState] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Future] = None
+        self._polls: Set[asyncio.Future] = set()
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:  # created in running loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    def start(self) -> None:
+        self._task = asyncio.ensure_future(self.run())
+
+    async def stop(self) -> None:
+        tasks = [task for task in [self._task, *self._polls] if task is not None]
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def add_user(self, telegram_id: int, credentials: Dict[str, str]) -> None:
+        """
+        Start polling of user, the first poll only remembers current home works
+        :param telegram_id: User's telegram id
+        :param credentials: {"email": ..., "pwd": ...}
+        """
+        state = HomeWorkState(credentials=dict(credentials), interval=self.min_interval)
+        state.next_poll = time.monotonic()
+        self.states[telegram_id] = state
+
+    def remove_user(self, telegram_id: int) -> None:
+        self.states.pop(telegram_id, None)
+
+    def get_subjects(self, telegram_id: int) -> Optional[List[Dict[str, str]]]:
+        """
+        :return: Polled subjects of user or None if user is not polled yet
+        """
+        state = self.states.get(telegram_id)
+        if state is None or state.subjects is None:
+            return None
+
+        return [dict(subject) for subject in state.subjects]
+
+    def get_home_work(self, telegram_id: int, link: str) -> Optional[HomeWork]:
+        """
+        :param link: Subject's link
+        :return: Polled latest home work of subject, which has "file" link as
+            AsyncSiteEvents.scrape_home_works_of_subject returns.
+        :raise KeyError: Subject of user is not polled
+        """
+        state = self.states.get(telegram_id)
+        if state is None or state.subjects is None:
+            raise KeyError(link)
+
+        home_work = state.home_works[link]
+        return dict(home_work) if home_work is not None else None
+
+    def get_all_home_works(self, telegram_id: int) -> Optional[List[HomeWork]]:
+        """
+        :return: Polled home works of user with "subject" name, as
+            AsyncSiteEvents.scrape_all_home_works returns, or None if user is not polled yet
+        """
+        state = self.states.get(telegram_id)
+        if state is None or state.subjects is None:
+            return None
+
+        return [
+            {**home_work, "subject": subject["subject"]}
+            for subject, home_work in (
+                (subject, state.home_works.get(subject["link"]))
+                for subject in state.subjects
+            )
+            if home_work is not None
+        ]
+
+    async def load_users(self) -> None:
+        for user in await get_flagged_users("notify_home_works"):
+            if not is_local(user.telegram_id):  # polled by another worker
+                continue
+            if user.credentials is None:  # nothing to log in with
+                continue
+
+            self.states[user.telegram_id] = HomeWorkState(
+                credentials=user.credentials, interval=self.min_interval
+            )
+
+        logger.info(f"Polling home works of {len(self.states)} users")
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.load_users()
+                break
+            except Exception:
+                logger.exception("Users polling home works are not loaded")
+                await asyncio.sleep(POLL_TICK)
+
+        while True:
+            now = time.monotonic()
+
+            for telegram_id, state in self.states.items():
+                if not state.polling and state.next_poll <= now:
+                    state.polling = True
+                    task = asyncio.ensure_future(self.poll(telegram_id, state))
+                    self._polls.add(task)
+                    task.add_done_callback(self._polls.discard)
+
+            next_poll = min(
+                (
+                    state.next_poll
+                    for state in self.states.values()
+                    if not state.polling
+                ),
+                default=now + POLL_TICK,
+            )
+            await asyncio.sleep(min(max(next_poll - now, 0), POLL_TICK))
+
+    async def poll(self, telegram_id: int, state: HomeWorkState) -> None:
+        changed: List[str] = []
+
+        try:
+            async with self.semaphore:
+                changed = await self._poll(telegram_id, state)
+        except SessionExpired:
+            tipo_sessions.invalidate(telegram_id)
+            logger.warning(f"Home works of {telegram_id} not polled, session expired")
+        except Exception:
+            logger.exception(f"Home works of {telegram_id} not polled")
+        finally:
+            state.interval = (
+                self.min_interval
+                if changed
+                else min(state.interval * 2, self.max_interval)
+            )
+            state.next_poll = time.monotonic() + state.interval * random.uniform(
+                0.9, 1.1
+            )
+            state.polling = False
+
+        if self.states.get(telegram_id) is not state:  # opted out meanwhile
+            return
+
+        for link in changed:
+            await self.notify(telegram_id, state, link)
+
+    async def _poll(self, telegram_id: int, state: HomeWorkState) -> List[str]:
+        """
+        Scrape the latest home works of user into state
+        :return: Links of subjects whose latest home work has changed
+        """
+        site_events = await get_site_events(
+            telegram_id=telegram_id, credentials=state.credentials
+        )
+        if site_events is None:
+            logger.warning(f"Home works of {telegram_id} not polled, login failed")
+            return []
+
+        subjects = await site_events.scrape_subjects("home")
+        home_works = await site_events.scrape_home_works_of_subjects(subjects)
+
+        changed = []
+        for subject, home_work in zip(subjects, home_works):
+            previous = state.home_works.get(subject["link"])
+            if (
+                state.subjects is not None
+                and home_work is not None
+                and (previous is None or previous["data_key"] != home_work["data_key"])
+            ):
+                changed.append(subject["link"])
+
+        state.subjects = subjects
+        state.home_works = {
+            subject["link"]: home_work
+            for subject, home_work in zip(subjects, home_works)
+        }
+        return changed
+
+    async def notify(self, telegram_id: int, state: HomeWorkState, link: str) -> None:
+        home_work = state.home_works[link]
+        if home_work is None:
+            return
+
+        subject = next(
+            subject["subject"]
+            for subject in state.subjects or []
+            if subject["link"] == link
+        )
+
+        try:
+            await self.bot.send_message(
+                telegram_id,
+                dialog.new_home_work.format(
+                    subject=subject,
+                    name=home_work["name"],
+                    deadline=home_work["deadline"],
+                ),
+            )
+        except Exception:
+            logger.exception(f"Notification of {telegram_id} is not sent")
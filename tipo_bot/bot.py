@@ -1,33 +1,156 @@
-import json
+import functools
+import hashlib
 import logging
+from typing import Dict, NamedTuple, Optional, Union
 
 import aiogram.utils.markdown as md
 from aiogram import Bot, Dispatcher, types
-from aiogram.contrib.fsm_storage.memory import MemoryStorage
 from aiogram.dispatcher import FSMContext
 from aiogram.dispatcher.filters import Text
+from aiogram.utils.exceptions import WrongFileIdentifier
 
 import core.resources as dialog
-from core.buttons import Buttons
+from core.custom_exceptions import SessionExpired
 from core.states import TipoCredentialsState
 from settings import BOT_API_TOKEN
 
-from .services.scraper import SiteEvents
-from .services.utils import get_today_date
-
+from .background import AttendanceScheduler, HomeWorkPoller
+from .database.conf import db_executor
+from .database.fsm_storage import create_storage
+from .services.async_scraper import AsyncSiteEvents
+from .services.utils import deadline_of, get_today_date, hashed_chunks
+
+from core.buttons import (  # isort:skip
+    CLASS_WORK_PREFIX,
+    HOME_WORK_PREFIX,
+    buttons_constructor,
+    cancel_keyboard,
+    command_keyboard,
+)
 from .utils import (  # isort:skip
     get_or_create_user,
-    remove_file_from_storage,
+    get_week_schedule,
     check_for_session,
+    forget_attachment,
+    get_attachment_file_id,
+    scrapes,
+    save_attachment,
+    set_user_flag,
+    split_message,
+    tipo_sessions,
     update_users_tipo_creds,
     validate_creds,
+    visit_lessons,
 )
 
 bot = Bot(token=BOT_API_TOKEN)
-storage = MemoryStorage()
+storage = create_storage()
 dp = Dispatcher(bot, storage=storage)
 
-buttons_constructor = Buttons()
+attendance_scheduler = AttendanceScheduler()
+home_work_poller = HomeWorkPoller(bot=bot)
+
+
+class Toggle(NamedTuple):
+    """
+    Opt-in feature: User's column, background service, replies
+    """
+
+    column: str
+    service: Union[AttendanceScheduler, HomeWorkPoller]
+    text_on: str
+    text_off: str
+
+
+# Opt-in features by callback data
+TOGGLES: Dict[str, Toggle] = {
+    "toggle_auto_attend": Toggle(
+        column="auto_attend",
+        service=attendance_scheduler,
+        text_on=dialog.auto_attend_on,
+        text_off=dialog.auto_attend_off,
+    ),
+    "toggle_notify_home_works": Toggle(
+        column="notify_home_works",
+        service=home_work_poller,
+        text_on=dialog.notify_home_works_on,
+        text_off=dialog.notify_home_works_off,
+    ),
+}
+
+
+async def on_startup(dispatcher: Dispatcher):
+    attendance_scheduler.start()
+    home_work_poller.start()
+
+
+async def on_shutdown(dispatcher: Dispatcher):
+    await attendance_scheduler.stop()
+    await home_work_poller.stop()
+    await tipo_sessions.close()
+    db_executor.shutdown(wait=True)
+
+
+async def resend_attachment(chat_id: int, file_id: str) -> bool:
+    """
+    Send file uploaded before by its Telegram file_id
+    :return: False if Telegram rejected file_id, it is forgotten then
+    """
+    try:
+        await bot.send_document(chat_id, document=file_id)
+    except WrongFileIdentifier:
+        await forget_attachment(file_id)
+        return False
+
+    return True
+
+
+async def send_attachment(
+    chat_id: int,
+    site_events: AsyncSiteEvents,
+    link: str,
+    filename: str,
+    version: Optional[str] = None,
+) -> None:
+    """
+    Resend attached file by Telegram file_id if this version of it was uploaded before.
+    Otherwise file is downloaded once and uploaded to chat while it is being downloaded
+    and hashed, file is never kept whole in memory or storage.
+    :param version: Changes when file at link is replaced, e.g. updated_at of class work
+    """
+    uploaded = await get_attachment_file_id(link, version)
+    if uploaded is not None and await resend_attachment(chat_id, uploaded):
+        return
+
+    digest = hashlib.sha256()
+    async with site_events.open_file(link) as stream:
+        message = await bot.send_document(
+            chat_id, document=(filename, hashed_chunks(stream, digest))
+        )
+
+    await save_attachment(
+        url=link,
+        content_hash=digest.hexdigest(),
+        file_id=message.document.file_id,
+        version=version,
+    )
+
+
+@dp.errors_handler(exception=SessionExpired)
+async def session_expired_handler(update: types.Update, exception: SessionExpired):
+    """
+    Drop cached session rejected by the site, next request logs in again
+    """
+    user = types.User.get_current()
+    if user is None:
+        return False
+
+    tipo_sessions.invalidate(user.id)
+
+    await bot.send_message(
+        user.id, dialog.session_expired, reply_markup=command_keyboard
+    )
+    return True
 
 
 @dp.message_handler(state="*", commands="cancel")
@@ -77,16 +200,14 @@ async def send_welcome(message: types.Message):
         telegram_id=message.from_user.id, first_name=message.from_user.first_name
     )
 
-    buttons = buttons_constructor.init_inline(buttons=dialog.command_buttons)
     await message.reply(
         md.text(dialog.welcome_message.format(name=message.from_user.first_name)),
-        reply_markup=buttons,
+        reply_markup=command_keyboard,
     )
 
 
 @dp.callback_query_handler(lambda c: c.data == "get_account")
 async def process_callback_get_account(callback_query: types.CallbackQuery):
-    buttons = buttons_constructor.init_inline(buttons=dialog.command_buttons)
     await bot.answer_callback_query(callback_query.id)
 
     await bot.send_chat_action(callback_query.from_user.id, "Typing")
@@ -100,18 +221,17 @@ async def process_callback_get_account(callback_query: types.CallbackQuery):
             name=user.first_name,
             telegram_id=user.telegram_id,
             tipo_email=(
-                json.loads(user.tipo_credentials)["email"]
-                if user.tipo_credentials is not None
+                user.credentials["email"]
+                if user.credentials is not None
                 else "No creds."
             ),
         ),
-        reply_markup=buttons,
+        reply_markup=command_keyboard,
     )
 
 
 @dp.callback_query_handler(lambda c: c.data == "get_schedule")
 async def process_callback_get_schedule(callback_query: types.CallbackQuery):
-    buttons = buttons_constructor.init_inline(buttons=dialog.command_buttons)
     await bot.answer_callback_query(callback_query.id)
 
     reply_text = [md.text(f"{get_today_date()}")]
@@ -121,18 +241,23 @@ async def process_callback_get_schedule(callback_query: types.CallbackQuery):
         telegram_id=callback_query.from_user.id,
         first_name=callback_query.from_user.first_name,
     )
-    session = await check_for_session(
-        bot=bot, user=user, buttons=buttons, telegram_id=callback_query.from_user.id
+    site_events = await check_for_session(
+        bot=bot,
+        user=user,
+        buttons=command_keyboard,
+        telegram_id=callback_query.from_user.id,
     )
-    if session is None:
+    if site_events is None:
         return
 
-    site_events = SiteEvents(login_session=session)
-    schedule = site_events.get_todays_schedule()
+    week = await get_week_schedule(
+        telegram_id=callback_query.from_user.id, site_events=site_events
+    )
+    schedule = week.get(get_today_date())
 
     if schedule is None:
         await bot.send_message(
-            callback_query.from_user.id, "No schedule", reply_markup=buttons
+            callback_query.from_user.id, "No schedule", reply_markup=command_keyboard
         )
         return
 
@@ -157,14 +282,13 @@ async def process_callback_get_schedule(callback_query: types.CallbackQuery):
     await bot.send_message(
         callback_query.from_user.id,
         reply_text,
-        reply_markup=buttons,
+        reply_markup=command_keyboard,
         parse_mode=types.message.ParseMode.HTML,
     )
 
 
 @dp.callback_query_handler(lambda c: c.data == "visit_lesson")
 async def process_callback_visit_lesson(callback_query: types.CallbackQuery):
-    buttons = buttons_constructor.init_inline(buttons=dialog.command_buttons)
     await bot.answer_callback_query(callback_query.id)
 
     await bot.send_chat_action(callback_query.from_user.id, "Typing")
@@ -172,60 +296,123 @@ async def process_callback_visit_lesson(callback_query: types.CallbackQuery):
         telegram_id=callback_query.from_user.id,
         first_name=callback_query.from_user.first_name,
     )
-    session = await check_for_session(
-        bot=bot, user=user, buttons=buttons, telegram_id=callback_query.from_user.id
+    site_events = await check_for_session(
+        bot=bot,
+        user=user,
+        buttons=command_keyboard,
+        telegram_id=callback_query.from_user.id,
     )
-    if session is None:
+    if site_events is None:
         return
 
-    site_events = SiteEvents(login_session=session)
-    visited_lessons: list = site_events.go_to_lesson()
+    week = await get_week_schedule(
+        telegram_id=callback_query.from_user.id, site_events=site_events
+    )
+    visited_lessons = await scrapes.do(
+        (callback_query.from_user.id, "visit_lessons", get_today_date()),
+        functools.partial(
+            visit_lessons,
+            telegram_id=callback_query.from_user.id,
+            site_events=site_events,
+            schedule=week.get(get_today_date()),
+        ),
+    )
 
     reply_text = []
 
     for visited_lesson in visited_lessons:
-        reply_text.append(
-            md.text(
-                dialog.visit_lessons.format(
-                    lesson_name=visited_lesson["subject"],
-                    link=md.hlink("Lesson url", visited_lesson["link"]),
-                )
+        link = md.hlink("Lesson url", visited_lesson["link"])
+
+        if visited_lesson["visited"]:
+            text = dialog.visit_lessons.format(
+                lesson_name=visited_lesson["subject"], link=link
+            )
+        else:
+            text = dialog.visit_lessons_failed.format(
+                lesson_name=visited_lesson["subject"],
+                error=visited_lesson["error"],
+                link=link,
             )
-        )
+
+        reply_text.append(md.text(text))
 
     await bot.send_message(
         callback_query.from_user.id,
         md.text(*reply_text, sep="\n"),
-        reply_markup=buttons,
+        reply_markup=command_keyboard,
         parse_mode=types.message.ParseMode.HTML,
     )
 
 
+@dp.callback_query_handler(lambda c: c.data in TOGGLES)
+async def process_callback_toggle(callback_query: types.CallbackQuery):
+    await bot.answer_callback_query(callback_query.id)
+    column, service, text_on, text_off = TOGGLES[callback_query.data]
+
+    user = await get_or_create_user(
+        telegram_id=callback_query.from_user.id,
+        first_name=callback_query.from_user.first_name,
+    )
+    if user.credentials is None:
+        await bot.send_message(
+            callback_query.from_user.id,
+            "You have not inserted account credentials",
+            reply_markup=command_keyboard,
+        )
+        return
+
+    enabled = not getattr(user, column)
+    if not await set_user_flag(
+        telegram_id=user.telegram_id, column=column, enabled=enabled
+    ):
+        await bot.send_message(
+            callback_query.from_user.id,
+            "Fail. Something went wrong",
+            reply_markup=command_keyboard,
+        )
+        return
+
+    if enabled:
+        await bot.send_chat_action(callback_query.from_user.id, "Typing")
+        await service.add_user(
+            telegram_id=user.telegram_id, credentials=user.credentials
+        )
+    else:
+        service.remove_user(user.telegram_id)
+
+    await bot.send_message(
+        callback_query.from_user.id,
+        text_on if enabled else text_off,
+        reply_markup=command_keyboard,
+    )
+
+
 @dp.callback_query_handler(lambda c: c.data == "get_class_work")
 async def process_callback_get_class_work(callback_query: types.CallbackQuery):
     await bot.answer_callback_query(callback_query.id)
-    buttons = buttons_constructor.init_inline(buttons=dialog.command_buttons)
-
     await bot.send_chat_action(callback_query.from_user.id, "Typing")
     user = await get_or_create_user(
         telegram_id=callback_query.from_user.id,
         first_name=callback_query.from_user.first_name,
     )
-    session = await check_for_session(
-        bot=bot, user=user, buttons=buttons, telegram_id=callback_query.from_user.id
+    site_events = await check_for_session(
+        bot=bot,
+        user=user,
+        buttons=command_keyboard,
+        telegram_id=callback_query.from_user.id,
     )
-    if session is None:
+    if site_events is None:
         return
 
-    site_events = SiteEvents(login_session=session)
-    class_work_links = site_events.scrape_subjects("class")
+    class_work_links = await scrapes.do(
+        (callback_query.from_user.id, "subjects", "class"),
+        functools.partial(site_events.scrape_subjects, "class"),
+    )
 
-    reply_buttons = buttons_constructor.init_inline(
-        row_width=2,
-        buttons=[
-            {"name": button["subject"], "callback_data": f"classwork__{button['link']}"}
-            for button in class_work_links
-        ],
+    reply_buttons = buttons_constructor.init_subjects(
+        telegram_id=callback_query.from_user.id,
+        subjects=class_work_links,
+        callback_prefix=CLASS_WORK_PREFIX,
     )
 
     await bot.send_message(
@@ -235,26 +422,76 @@ async def process_callback_get_class_work(callback_query: types.CallbackQuery):
     )
 
 
-@dp.callback_query_handler(lambda c: "classwork__" in c.data)
+async def get_subject_of_button(
+    callback_query: types.CallbackQuery, prefix: str, type_: str
+) -> Optional[Dict[str, str]]:
+    """
+    Find subject of pressed subject button in registry. Subjects are scraped again
+    if registry has forgotten them, e.g. after restart.
+    :param prefix: Callback data prefix of button
+    :param type_: "class" or "home"
+    :return: Subject or None if it is not found, user is informed then
+    """
+    telegram_id = callback_query.from_user.id
+    id_ = callback_query.data[len(prefix) :]
+
+    subject = buttons_constructor.subjects.get(telegram_id, id_)
+    if subject is not None:
+        return subject
+
+    subjects = home_work_poller.get_subjects(telegram_id) if type_ == "home" else None
+    if subjects is None:
+        user = await get_or_create_user(
+            telegram_id=telegram_id, first_name=callback_query.from_user.first_name
+        )
+        site_events = await check_for_session(
+            bot=bot, user=user, buttons=command_keyboard, telegram_id=telegram_id
+        )
+        if site_events is None:
+            return None
+
+        subjects = await scrapes.do(
+            (telegram_id, "subjects", type_),
+            functools.partial(site_events.scrape_subjects, type_),
+        )
+
+    buttons_constructor.subjects.register(telegram_id, subjects)
+    subject = buttons_constructor.subjects.get(telegram_id, id_)
+    if subject is None:
+        await bot.send_message(
+            telegram_id, dialog.subject_not_found, reply_markup=command_keyboard
+        )
+
+    return subject
+
+
+@dp.callback_query_handler(lambda c: c.data.startswith(CLASS_WORK_PREFIX))
 async def process_classword_link(callback_query: types.CallbackQuery):
     await bot.answer_callback_query(callback_query.id)
-    buttons = buttons_constructor.init_inline(buttons=dialog.command_buttons)
-
     await bot.send_chat_action(callback_query.from_user.id, "Typing")
+    subject = await get_subject_of_button(callback_query, CLASS_WORK_PREFIX, "class")
+    if subject is None:
+        return
+
     user = await get_or_create_user(
         telegram_id=callback_query.from_user.id,
         first_name=callback_query.from_user.first_name,
     )
-    session = await check_for_session(
-        bot=bot, user=user, buttons=buttons, telegram_id=callback_query.from_user.id
+    site_events = await check_for_session(
+        bot=bot,
+        user=user,
+        buttons=command_keyboard,
+        telegram_id=callback_query.from_user.id,
     )
-    if session is None:
+    if site_events is None:
         return
 
-    site_events = SiteEvents(login_session=session)
-    subject_link = callback_query.data.split("__")[-1]
+    subject_link = subject["link"]
 
-    result = site_events.scrape_class_works_of_subject(link=subject_link)
+    result = await scrapes.do(
+        (callback_query.from_user.id, "class_work", subject_link),
+        functools.partial(site_events.scrape_class_works_of_subject, link=subject_link),
+    )
 
     if result is None:
         await bot.send_message(
@@ -280,37 +517,44 @@ async def process_classword_link(callback_query: types.CallbackQuery):
 
     elif result["type"] == "file":
         if result["file"] is not None:
-            file = types.InputFile(result["file"], filename=result["filename"])
-            await bot.send_document(callback_query.from_user.id, document=file)
-
-            remove_file_from_storage(result["file"])
+            await send_attachment(
+                chat_id=callback_query.from_user.id,
+                site_events=site_events,
+                link=result["file"],
+                filename=result["filename"],
+                version=result["updated_at"],
+            )
 
 
 @dp.callback_query_handler(lambda c: c.data == "get_home_work")
 async def process_callback_get_home_work(callback_query: types.CallbackQuery):
     await bot.answer_callback_query(callback_query.id)
-    buttons = buttons_constructor.init_inline(buttons=dialog.command_buttons)
-
     await bot.send_chat_action(callback_query.from_user.id, "Typing")
     user = await get_or_create_user(
         telegram_id=callback_query.from_user.id,
         first_name=callback_query.from_user.first_name,
     )
-    session = await check_for_session(
-        bot=bot, user=user, buttons=buttons, telegram_id=callback_query.from_user.id
-    )
-    if session is None:
-        return
 
-    site_events = SiteEvents(login_session=session)
-    home_work_links = site_events.scrape_subjects("home")
+    home_work_links = home_work_poller.get_subjects(callback_query.from_user.id)
+    if home_work_links is None:
+        site_events = await check_for_session(
+            bot=bot,
+            user=user,
+            buttons=command_keyboard,
+            telegram_id=callback_query.from_user.id,
+        )
+        if site_events is None:
+            return
 
-    reply_buttons = buttons_constructor.init_inline(
-        row_width=2,
-        buttons=[
-            {"name": button["subject"], "callback_data": f"homework__{button['link']}"}
-            for button in home_work_links
-        ],
+        home_work_links = await scrapes.do(
+            (callback_query.from_user.id, "subjects", "home"),
+            functools.partial(site_events.scrape_subjects, "home"),
+        )
+
+    reply_buttons = buttons_constructor.init_subjects(
+        telegram_id=callback_query.from_user.id,
+        subjects=home_work_links,
+        callback_prefix=HOME_WORK_PREFIX,
     )
 
     await bot.send_message(
@@ -320,26 +564,103 @@ async def process_callback_get_home_work(callback_query: types.CallbackQuery):
     )
 
 
-@dp.callback_query_handler(lambda c: "homework__" in c.data)
-async def process_homework_link(callback_query: types.CallbackQuery):
+async def send_all_home_works(telegram_id: int, first_name: str) -> None:
+    """
+    Send the latest home work of every subject sorted by deadline
+    """
+    await bot.send_chat_action(telegram_id, "Typing")
+    home_works = home_work_poller.get_all_home_works(telegram_id)
+
+    if home_works is None:
+        user = await get_or_create_user(telegram_id=telegram_id, first_name=first_name)
+        site_events = await check_for_session(
+            bot=bot, user=user, buttons=command_keyboard, telegram_id=telegram_id
+        )
+        if site_events is None:
+            return
+
+        home_works = await scrapes.do(
+            (telegram_id, "all_home_works", None), site_events.scrape_all_home_works
+        )
+
+    if not home_works:
+        await bot.send_message(
+            telegram_id,
+            dialog.no_type_works.format(type_="home"),
+            reply_markup=command_keyboard,
+        )
+        return
+
+    messages = split_message(
+        [
+            dialog.all_hw_item.format(
+                subject=home_work["subject"],
+                name=home_work["name"],
+                deadline=home_work["deadline"],
+                teacher=home_work["teacher"],
+            )
+            for home_work in sorted(
+                home_works, key=lambda home_work: deadline_of(home_work["deadline"])
+            )
+        ]
+    )
+
+    for message in messages[:-1]:
+        await bot.send_message(telegram_id, message)
+    await bot.send_message(telegram_id, messages[-1], reply_markup=command_keyboard)
+
+
+@dp.message_handler(commands="homeworks")
+async def all_home_works_command(message: types.Message):
+    await send_all_home_works(
+        telegram_id=message.from_user.id, first_name=message.from_user.first_name
+    )
+
+
+@dp.callback_query_handler(lambda c: c.data == "get_all_home_works")
+async def process_callback_get_all_home_works(callback_query: types.CallbackQuery):
     await bot.answer_callback_query(callback_query.id)
-    buttons = buttons_constructor.init_inline(buttons=dialog.command_buttons)
+    await send_all_home_works(
+        telegram_id=callback_query.from_user.id,
+        first_name=callback_query.from_user.first_name,
+    )
+
 
+@dp.callback_query_handler(lambda c: c.data.startswith(HOME_WORK_PREFIX))
+async def process_homework_link(callback_query: types.CallbackQuery):
+    await bot.answer_callback_query(callback_query.id)
     await bot.send_chat_action(callback_query.from_user.id, "Typing")
+    subject = await get_subject_of_button(callback_query, HOME_WORK_PREFIX, "home")
+    if subject is None:
+        return
+
     user = await get_or_create_user(
         telegram_id=callback_query.from_user.id,
         first_name=callback_query.from_user.first_name,
     )
-    session = await check_for_session(
-        bot=bot, user=user, buttons=buttons, telegram_id=callback_query.from_user.id
-    )
-    if session is None:
-        return
+    subject_link = subject["link"]
+    site_events = None
 
-    site_events = SiteEvents(login_session=session)
-    subject_link = callback_query.data.split("__")[-1]
+    try:
+        result = home_work_poller.get_home_work(
+            telegram_id=callback_query.from_user.id, link=subject_link
+        )
+    except KeyError:  # user or subject is not polled
+        site_events = await check_for_session(
+            bot=bot,
+            user=user,
+            buttons=command_keyboard,
+            telegram_id=callback_query.from_user.id,
+        )
+        if site_events is None:
+            return
 
-    result = site_events.scrape_home_works_of_subject(link=subject_link)
+        result = await scrapes.do(
+            (callback_query.from_user.id, "home_work", subject_link),
+            functools.partial(
+                site_events.scrape_home_works_of_subject, link=subject_link
+            ),
+        )
 
     if result is None:
         await bot.send_message(
@@ -358,11 +679,27 @@ async def process_homework_link(callback_query: types.CallbackQuery):
         ),
     )
 
-    if result["file"] is not None:
-        file = types.InputFile(result["file"], filename=result["filename"])
-        await bot.send_document(callback_query.from_user.id, document=file)
+    link, filename = result["file"], result["filename"]
+    if link is None or filename is None:
+        return
 
-        remove_file_from_storage(result["file"])
+    if site_events is None:
+        site_events = await check_for_session(
+            bot=bot,
+            user=user,
+            buttons=command_keyboard,
+            telegram_id=callback_query.from_user.id,
+        )
+        if site_events is None:
+            return
+
+    await send_attachment(
+        chat_id=callback_query.from_user.id,
+        site_events=site_events,
+        link=link,
+        filename=filename,
+        version=result["data_key"],
+    )
 
 
 @dp.callback_query_handler(lambda c: c.data == "set_account")
@@ -373,14 +710,12 @@ async def process_callback_set_account(callback_query: types.CallbackQuery):
     await bot.send_message(
         callback_query.from_user.id,
         md.text(dialog.creds_format.format(format="email:password")),
-        reply_markup=buttons_constructor.init_cancel_button(),
+        reply_markup=cancel_keyboard,
     )
 
 
 @dp.message_handler(state=TipoCredentialsState.credentials)
 async def process_credentials(message: types.Message, state: FSMContext):
-    buttons = buttons_constructor.init_inline(buttons=dialog.command_buttons)
-
     await bot.send_chat_action(message.from_user.id, "Typing")
     async with state.proxy() as data:
         if (
@@ -389,7 +724,8 @@ async def process_credentials(message: types.Message, state: FSMContext):
             and "Cancel" not in message.text
         ):
             await message.reply(
-                "Not correct credentials format, try again", reply_markup=buttons
+                "Not correct credentials format, try again",
+                reply_markup=command_keyboard,
             )
             await state.finish()
             return
@@ -401,10 +737,19 @@ async def process_credentials(message: types.Message, state: FSMContext):
         )
 
     if status:
+        user = await get_or_create_user(
+            telegram_id=message.from_user.id, first_name=message.from_user.first_name
+        )
+        for column, service, *_ in TOGGLES.values():
+            if getattr(user, column):  # restart with new credentials
+                await service.add_user(
+                    telegram_id=user.telegram_id, credentials=data["credentials"]
+                )
+
         await message.reply(
-            "Success, credentials have been updated!", reply_markup=buttons
+            "Success, credentials have been updated!", reply_markup=command_keyboard
         )
     elif not status:
-        await message.reply("Fail. Something went wrong", reply_markup=buttons)
+        await message.reply("Fail. Something went wrong", reply_markup=command_keyboard)
 
     await state.finish()
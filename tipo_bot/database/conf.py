@@ -1,10 +1,18 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
 import pymysql
 import sqlalchemy
 from sqlalchemy import Column, Integer, create_engine
+from sqlalchemy.engine.url import make_url
 from sqlalchemy.ext.declarative import declarative_base, declared_attr
 from sqlalchemy.orm import sessionmaker
 
-from settings import DB_LINK
+from settings import DB_LINK, DB_MAX_OVERFLOW, DB_POOL_SIZE, DB_POOL_TIMEOUT
+
+T = TypeVar("T")
 
 
 class Base:
@@ -18,12 +26,34 @@ class Base:
     id = Column(Integer, primary_key=True, autoincrement=True)
 
 
+pool_options: Dict[str, Any] = {}
+if make_url(DB_LINK).get_backend_name() != "sqlite":  # sqlite pools are not sized
+    pool_options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    }
+
 pymysql.install_as_MySQLdb()
 engine: sqlalchemy.engine.base.Engine = create_engine(
-    DB_LINK, pool_recycle=3600, pool_pre_ping=True
+    DB_LINK, pool_recycle=3600, pool_pre_ping=True, **pool_options
 )
 session: sqlalchemy.orm.session.sessionmaker = sessionmaker(
     autocommit=False, autoflush=False, bind=engine
 )
 
 base = declarative_base(cls=Base)
+
+# Blocking database calls run here instead of event loop, one thread per pooled connection
+db_executor = ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix="db")
+
+
+async def run_sync(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run blocking database call in db_executor
+    :return: Result of func(*args, **kwargs)
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(
+        db_executor, functools.partial(func, *args, **kwargs)
+    )
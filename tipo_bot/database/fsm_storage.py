@@ -0,0 +1,293 @@
+"""
+aiogram FSM storage in SQLite database, shared by bot workers of one host
+"""
+import asyncio
+import copy
+import json
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple, Union
+
+from aiogram.contrib.fsm_storage.memory import MemoryStorage
+from aiogram.dispatcher.storage import BaseStorage
+
+from settings import (  # isort:skip
+    FSM_FLUSH_INTERVAL,
+    FSM_STATE_TTL,
+    FSM_STORAGE,
+    FSM_STORAGE_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+CLEANUP_INTERVAL = 60  # seconds between deletes of expired records
+
+Address = Tuple[str, str]
+Record = Dict[str, Any]  # {"state": ..., "data": {...}, "bucket": {...}}
+ChatOrUser = Union[str, int, None]
+
+
+def empty_record() -> Record:
+    return {"state": None, "data": {}, "bucket": {}}
+
+
+class SQLiteStorage(BaseStorage):
+    """
+    States, data and buckets in SQLite database in WAL mode, so several processes can use it.
+    Writes are kept in memory and flushed in one transaction every flush_interval seconds,
+    records not written for ttl seconds are deleted.
+    Write of a worker is seen by other workers after flush, updates of one user
+    should be handled by one worker.
+    """
+
+    def __init__(
+        self,
+        path: str = FSM_STORAGE_PATH,
+        ttl: float = FSM_STATE_TTL,
+        flush_interval: float = FSM_FLUSH_INTERVAL,
+    ) -> None:
+        """
+        :param path: Path of database file
+        :param ttl: Seconds after last write when record is deleted
+        :param flush_interval: Seconds writes are collected before being flushed
+        """
+        self.path = path
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        # Connection is used by the only thread of executor
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fsm")
+        self._connection: Optional[sqlite3.Connection] = None
+        self._last_cleanup = 0.0
+        self._pending: Dict[Address, Record] = {}
+        self._flushing: Dict[Address, Record] = {}
+        self._flush_task: Optional[asyncio.Future] = None
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS fsm ("
+                "chat TEXT NOT NULL, user TEXT NOT NULL, record TEXT NOT NULL, "
+                "updated_at REAL NOT NULL, PRIMARY KEY (chat, user))"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_fsm_updated_at ON fsm (updated_at)"
+            )
+            connection.commit()
+            self._connection = connection
+
+        return self._connection
+
+    def _read(self, address: Address) -> Optional[Record]:
+        row = (
+            self._connect()
+            .execute(
+                "SELECT record FROM fsm WHERE chat = ? AND user = ? AND updated_at > ?",
+                (*address, time.time() - self.ttl),
+            )
+            .fetchone()
+        )
+        return json.loads(row[0]) if row is not None else None
+
+    def _write(self, records: Dict[Address, Record]) -> None:
+        now = time.time()
+        connection = self._connect()
+
+        with connection:  # one transaction
+            connection.executemany(
+                "DELETE FROM fsm WHERE chat = ? AND user = ?",
+                [
+                    address
+                    for address, record in records.items()
+                    if record == empty_record()
+                ],
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO fsm (chat, user, record, updated_at) VALUES (?, ?, ?, ?)",
+                [
+                    (*address, json.dumps(record), now)
+                    for address, record in records.items()
+                    if record != empty_record()
+                ],
+            )
+
+            if now - self._last_cleanup > CLEANUP_INTERVAL:
+                connection.execute(
+                    "DELETE FROM fsm WHERE updated_at <= ?", (now - self.ttl,)
+                )
+                self._last_cleanup = now
+
+    async def _run(self, func, *args) -> Any:
+        return await asyncio.get_event_loop().run_in_executor(
+            self._executor, func, *args
+        )
+
+    def _address(self, chat: ChatOrUser, user: ChatOrUser) -> Address:
+        chat, user = self.check_address(chat=chat, user=user)
+        return str(chat), str(user)
+
+    async def _get_record(self, chat: ChatOrUser, user: ChatOrUser) -> Record:
+        address = self._address(chat, user)
+
+        record = self._pending.get(address) or self._flushing.get(address)
+        if record is None:
+            stored = await self._run(self._read, address)
+            # Written while it was read
+            record = self._pending.get(address) or self._flushing.get(address) or stored
+
+        return copy.deepcopy(record) if record is not None else empty_record()
+
+    async def _set_record(
+        self, chat: ChatOrUser, user: ChatOrUser, record: Record
+    ) -> None:
+        address = self._address(chat, user)
+        self._pending[address] = copy.deepcopy(record)
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """
+        Write pending records to database
+        """
+        if not self._pending:
+            return
+
+        self._flushing, self._pending = self._pending, {}
+        try:
+            await self._run(self._write, self._flushing)
+        except Exception:
+            logger.exception("FSM records are not written")
+            # Records written after the failed ones are newer
+            self._pending = {**self._flushing, **self._pending}
+        finally:
+            self._flushing = {}
+
+        if self._pending and not self._closed:
+            # Written during the flush or not written because of failure,
+            # the running flush task can't be awaited by _set_record
+            self._flush_task = asyncio.ensure_future(self._flush_later())
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        await self.flush()
+
+        if self._connection is not None:
+            await self._run(self._connection.close)
+            self._connection = None
+
+    async def wait_closed(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    async def get_state(
+        self,
+        *,
+        chat: ChatOrUser = None,
+        user: ChatOrUser = None,
+        default: Optional[str] = None,
+    ) -> Optional[str]:
+        record = await self._get_record(chat, user)
+        return record["state"] if record["state"] is not None else default
+
+    async def get_data(
+        self,
+        *,
+        chat: ChatOrUser = None,
+        user: ChatOrUser = None,
+        default: Optional[Dict] = None,
+    ) -> Dict:
+        record = await self._get_record(chat, user)
+        return record["data"] or copy.deepcopy(default or {})
+
+    async def set_state(
+        self,
+        *,
+        chat: ChatOrUser = None,
+        user: ChatOrUser = None,
+        state: Optional[str] = None,
+    ) -> None:
+        record = await self._get_record(chat, user)
+        record["state"] = state
+        await self._set_record(chat, user, record)
+
+    async def set_data(
+        self,
+        *,
+        chat: ChatOrUser = None,
+        user: ChatOrUser = None,
+        data: Optional[Dict] = None,
+    ) -> None:
+        record = await self._get_record(chat, user)
+        record["data"] = data or {}
+        await self._set_record(chat, user, record)
+
+    async def update_data(
+        self,
+        *,
+        chat: ChatOrUser = None,
+        user: ChatOrUser = None,
+        data: Optional[Dict] = None,
+        **kwargs,
+    ) -> None:
+        record = await self._get_record(chat, user)
+        record["data"].update(data or {}, **kwargs)
+        await self._set_record(chat, user, record)
+
+    def has_bucket(self) -> bool:
+        return True
+
+    async def get_bucket(
+        self,
+        *,
+        chat: ChatOrUser = None,
+        user: ChatOrUser = None,
+        default: Optional[dict] = None,
+    ) -> Dict:
+        record = await self._get_record(chat, user)
+        return record["bucket"] or copy.deepcopy(default or {})
+
+    async def set_bucket(
+        self,
+        *,
+        chat: ChatOrUser = None,
+        user: ChatOrUser = None,
+        bucket: Optional[Dict] = None,
+    ) -> None:
+        record = await self._get_record(chat, user)
+        record["bucket"] = bucket or {}
+        await self._set_record(chat, user, record)
+
+    async def update_bucket(
+        self,
+        *,
+        chat: ChatOrUser = None,
+        user: ChatOrUser = None,
+        bucket: Optional[Dict] = None,
+        **kwargs,
+    ) -> None:
+        record = await self._get_record(chat, user)
+        record["bucket"].update(bucket or {}, **kwargs)
+        await self._set_record(chat, user, record)
+
+
+def create_storage(kind: str = FSM_STORAGE) -> BaseStorage:
+    """
+    :param kind: "memory" or "sqlite"
+    """
+    if kind == "memory":
+        return MemoryStorage()
+    if kind == "sqlite":
+        return SQLiteStorage()
+
+    raise ValueError(f"Unknown FSM storage {kind!r}, expected 'memory' or 'sqlite'")
@@ -1,11 +1,30 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Boolean, Column, Integer, String, false
 
 from .conf import base
 
 
 class User(base):
-    telegram_id = Column(Integer)
+    telegram_id = Column(Integer, index=True, unique=True)
     first_name = Column(String(length=255))
     tipo_credentials = Column(
         String(length=1000), nullable=True
     )  # Zhambyl tipo service's account creds
+    auto_attend = Column(
+        Boolean, nullable=False, default=False, server_default=false()
+    )  # Lessons are visited by background.AttendanceScheduler
+    notify_home_works = Column(
+        Boolean, nullable=False, default=False, server_default=false()
+    )  # New home works are polled by background.HomeWorkPoller
+
+
+class Attachment(base):
+    """
+    Telegram file_id of material already uploaded to Telegram, so it is resent without download
+    """
+
+    url = Column(String(length=512), unique=True)  # Absolute link of file on TIPO site
+    version = Column(
+        String(length=255), nullable=True
+    )  # Changes when file at url is replaced, e.g. updated_at of class work
+    content_hash = Column(String(length=64), index=True)  # sha256 of file
+    telegram_file_id = Column(String(length=255), index=True)
@@ -0,0 +1,172 @@
+import json
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session, sessionmaker
+
+from .conf import session
+from .models import Attachment, User
+
+
+@contextmanager
+def session_scope(factory: sessionmaker = session) -> Iterator[Session]:
+    """
+    Session committed on success, rolled back on error and always closed, so its connection
+    goes back to pool. Loaded objects stay readable after the session is closed.
+    """
+    ls: Session = factory(expire_on_commit=False)
+
+    try:
+        yield ls
+        ls.commit()
+    except Exception:
+        ls.rollback()
+        raise
+    finally:
+        ls.close()
+
+
+def upsert(
+    ls: Session, table: Table, values: Dict[str, Any], key: str, update: Sequence[str]
+) -> None:
+    """
+    Insert row or update columns of existing row with the same unique key, in one statement
+    :param table: Table of row
+    :param values: Values of row
+    :param key: Column with unique index
+    :param update: Columns updated if row exists
+    """
+    dialect = ls.get_bind().dialect.name
+
+    if dialect == "mysql":
+        statement = mysql.insert(table).values(**values)
+        statement = statement.on_duplicate_key_update(
+            {column: statement.inserted[column] for column in update}
+            or {key: statement.inserted[key]}
+        )
+        ls.execute(statement)
+    else:  # sqlite of tests and local runs
+        ls.execute(table.insert().prefix_with("OR IGNORE").values(**values))
+        if update:
+            ls.execute(
+                table.update()
+                .where(table.c[key] == values[key])
+                .values({column: values[column] for column in update})
+            )
+
+
+class UserRepository:
+    """
+    Users by telegram_id, which has unique index
+    """
+
+    def __init__(self, factory: sessionmaker = session) -> None:
+        self.factory = factory
+
+    def get_or_create(self, telegram_id: int, first_name: str) -> User:
+        """
+        Get user, known user costs one indexed select. New user is inserted by upsert,
+        so concurrent first messages of user can not create two rows.
+        """
+        with session_scope(self.factory) as ls:
+            user = ls.query(User).filter(User.telegram_id == telegram_id).one_or_none()
+            if user is not None:
+                return user
+
+            upsert(
+                ls,
+                User.__table__,
+                {"telegram_id": telegram_id, "first_name": first_name},
+                key="telegram_id",
+                update=["first_name"],
+            )
+            return ls.query(User).filter(User.telegram_id == telegram_id).one()
+
+    def update_credentials(self, telegram_id: int, credentials: Dict[str, str]) -> None:
+        with session_scope(self.factory) as ls:
+            ls.query(User).filter(User.telegram_id == telegram_id).update(
+                {User.tipo_credentials: json.dumps(credentials)}
+            )
+
+    def set_flag(self, telegram_id: int, column: str, enabled: bool) -> None:
+        """
+        :param column: Boolean column of User, "auto_attend" or "notify_home_works"
+        """
+        with session_scope(self.factory) as ls:
+            ls.query(User).filter(User.telegram_id == telegram_id).update(
+                {getattr(User, column): enabled}
+            )
+
+    def flagged(self, column: str) -> List[User]:
+        """
+        :param column: Boolean column of User, "auto_attend" or "notify_home_works"
+        :return: Users with credentials who opted in
+        """
+        with session_scope(self.factory) as ls:
+            return (
+                ls.query(User)
+                .filter(
+                    getattr(User, column).is_(True), User.tipo_credentials.isnot(None)
+                )
+                .all()
+            )
+
+
+class AttachmentRepository:
+    """
+    Telegram file_ids of attached files by url, which has unique index,
+    and by content hash, so identical files under different urls share one upload
+    """
+
+    def __init__(self, factory: sessionmaker = session) -> None:
+        self.factory = factory
+
+    def get_file_id(self, url: str, version: Optional[str] = None) -> Optional[str]:
+        """
+        :param version: Version of file at url, file_id of another version is not returned
+        """
+        with session_scope(self.factory) as ls:
+            attachment = (
+                ls.query(Attachment)
+                .filter(Attachment.url == url, Attachment.version == version)
+                .one_or_none()
+            )
+            return attachment.telegram_file_id if attachment is not None else None
+
+    def save(
+        self,
+        url: str,
+        content_hash: str,
+        file_id: str,
+        version: Optional[str] = None,
+    ) -> None:
+        with session_scope(self.factory) as ls:
+            upsert(
+                ls,
+                Attachment.__table__,
+                {
+                    "url": url,
+                    "version": version,
+                    "content_hash": content_hash,
+                    "telegram_file_id": file_id,
+                },
+                key="url",
+                update=["version", "content_hash", "telegram_file_id"],
+            )
+
+    def delete(self, url: str) -> None:
+        with session_scope(self.factory) as ls:
+            ls.query(Attachment).filter(Attachment.url == url).delete()
+
+    def delete_file_id(self, file_id: str) -> None:
+        """
+        Drop every url of file_id, e.g. one rejected by Telegram
+        """
+        with session_scope(self.factory) as ls:
+            ls.query(Attachment).filter(Attachment.telegram_file_id == file_id).delete()
+
+
+users = UserRepository()
+attachments = AttachmentRepository()
@@ -0,0 +1,369 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+import aiohttp
+
+from core.custom_exceptions import SessionExpired
+
+from .page_cache import PageCache, page_cache
+from .utils import HEADERS, get_today_date, is_login_page
+
+from typing import (  # isort:skip
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from settings import (  # isort:skip
+    LESSON_VISIT_CONCURRENCY,
+    LESSON_VISIT_TIMEOUT,
+    SUBJECT_SCRAPE_CONCURRENCY,
+)
+
+
+from .parsers import (  # isort:skip
+    parse_class_work_info,
+    parse_class_works_link,
+    parse_csrf_token,
+    parse_home_work,
+    parse_subjects,
+    parse_todays_schedule,
+    parse_week_schedule,
+    site_prefix,
+)
+
+logger = logging.getLogger(__name__)
+
+# Lesson of schedule with "visited" flag and "error" description, see go_to_lesson
+LessonVisit = Dict[str, Any]
+
+
+class AsyncAuth:
+    """
+    Authenticate methods class
+    """
+
+    def __init__(self) -> None:
+        self.csrf_token: Optional[str] = None
+        self.landing_page: Tuple[str, bytes] = ("", b"")
+        self.headers = HEADERS
+        self.login_url = f"{site_prefix}/kk/site/login"
+        self.logout_url = f"{site_prefix}/site/logout"
+        self.session = aiohttp.ClientSession(headers=self.headers)
+
+    async def get_csrf_token(self) -> Optional[str]:
+        """
+        Get csrf token from login page, it is valid for self.session only
+        :return: Csrf token or None
+        """
+        async with self.session.get(url=self.login_url) as response:
+            content = await response.read()
+        logger.info("Scraping csrf token")
+
+        return parse_csrf_token(content)
+
+    async def _post_login(self, username: str, password: str) -> int:
+        self.csrf_token = await self.get_csrf_token()
+        data: Dict[str, Optional[str]] = {
+            "_csrf": self.csrf_token,
+            "LoginForm[username]": username,
+            "LoginForm[password]": password,
+            "login-button": "",
+        }
+
+        logger.info("Logging in...")
+        async with self.session.post(url=self.login_url, data=data) as login_response:
+            self.landing_page = (str(login_response.url), await login_response.read())
+            return login_response.status
+
+    async def login(
+        self, username: str, password: str
+    ) -> Optional[aiohttp.ClientSession]:
+        """
+        Login to account. Site redirects away from login page only if credentials are correct,
+        page it redirects to is kept in self.landing_page.
+        :param username: Username
+        :param password: Password
+        :return: Logged in aiohttp.ClientSession object,
+            None if login failed. Session is closed if login failed or raised.
+        """
+        logged_in = False
+        try:
+            status = await self._post_login(username=username, password=password)
+            logged_in = status == 200 and not is_login_page(self.landing_page[0])
+            if not logged_in:
+                logger.warning(f"Login failed | {status}")
+        finally:
+            if not logged_in:
+                await self.session.close()
+
+        return self.session if logged_in else None
+
+    async def logout(self) -> bool:
+        """
+        Logout from accout
+        :return: if response.status is 200 returns True else False
+        """
+        data: Dict[str, Optional[str]] = {
+            "_csrf": self.csrf_token,
+        }
+
+        async with self.session.post(url=self.logout_url, data=data) as response:
+            logger.info("Logging out...")
+
+            if response.status == 200:
+                return True
+
+            logger.warning(f"Logout failed | {response.status}")
+            return False
+
+
+class AsyncSiteEvents:
+    """
+    Scraping methods of logged in session.
+    Attached files are not downloaded to storage: "file" of class and home works is absolute link,
+    which is streamed by open_file.
+    """
+
+    def __init__(
+        self,
+        login_session: aiohttp.ClientSession,
+        pages: Optional[Dict[str, bytes]] = None,
+        cache: PageCache = page_cache,
+        owner: Optional[Hashable] = None,
+    ):
+        """
+        :param login_session: Logged in session
+        :param pages: Already downloaded pages by url, each one is used instead of the first request to it.
+            E.g. page the site redirected to after login.
+        :param cache: Cache of parsed pages
+        :param owner: Stable identifier of account, e.g. its login. Requests are conditional
+            only if it is passed, validators of pages are kept under it.
+        """
+        self.login_session = login_session
+        self.pages = pages if pages is not None else {}
+        self.cache = cache
+        self.owner = owner
+        self.schedules_url = f"{site_prefix}/admin/student/schedules"
+        self.home_works_url = f"{site_prefix}/admin/student/homeworks"
+        self.class_works_url = f"{site_prefix}/admin/student/classworks"
+
+    async def _get(self, url: str) -> bytes:
+        """
+        :raise SessionExpired: Site redirected to login page
+        :raise aiohttp.ClientResponseError: Site answered with error status
+        """
+        content = self.pages.pop(url, None)
+        if content is not None:
+            return content
+
+        async with self.login_session.get(url=url, headers=HEADERS) as response:
+            if is_login_page(str(response.url)):
+                raise SessionExpired(f"Redirected to login page from {url}")
+
+            response.raise_for_status()
+            return await response.read()
+
+    async def _get_parsed(
+        self, url: str, parser: Callable[..., Any], *args: Any
+    ) -> Any:
+        """
+        Get page parsed by parser(content, *args). Request is conditional if site gave validators
+        of page before, unchanged page is taken from cache instead of being parsed.
+        """
+        content = self.pages.pop(url, None)
+        if content is not None:
+            return self.cache.parse(content, parser, *args)
+
+        headers = {**HEADERS, **self.cache.request_headers(self.owner, url)}
+        async with self.login_session.get(url=url, headers=headers) as response:
+            if is_login_page(str(response.url)):
+                raise SessionExpired(f"Redirected to login page from {url}")
+
+            if response.status == 304:
+                found, parsed = self.cache.not_modified(self.owner, url, parser, *args)
+                if found:
+                    return parsed
+            else:
+                return self.cache.parse(
+                    await response.read(),
+                    parser,
+                    *args,
+                    owner=self.owner,
+                    url=url,
+                    headers=response.headers,
+                )
+
+        # Parsed page is evicted from cache after 304 response
+        return self.cache.parse(await self._get(url), parser, *args)
+
+    async def get_todays_schedule(self) -> Optional[List[Dict[str, str]]]:
+        """
+        Get today's schedule
+        :return objects: List of dicts which contains info about time and subject's remote lesson link.
+            {"time": "09:00", "link": "some_link"}.
+        """
+        return await self._get_parsed(
+            self.schedules_url, parse_todays_schedule, get_today_date()
+        )
+
+    async def get_week_schedule(self) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Get schedule of every day of current week
+        :return: Lists of lessons (same as get_todays_schedule returns) by date in format dd.mm.YYYY
+        """
+        return await self._get_parsed(self.schedules_url, parse_week_schedule)
+
+    async def scrape_subjects(self, type_: str) -> List[Dict[str, str]]:
+        link: str = ""
+
+        if type_ == "home":
+            link = self.home_works_url
+        elif type_ == "class":
+            link = self.class_works_url
+
+        return await self._get_parsed(link, parse_subjects)
+
+    @asynccontextmanager
+    async def open_file(self, link: str) -> AsyncIterator[aiohttp.StreamReader]:
+        """
+        Open attached file for streaming, body is downloaded by chunks while it is consumed
+        :param link: Absolute link of file
+        :return: Stream of file's body
+        """
+        async with self.login_session.get(url=link, headers=HEADERS) as response:
+            if is_login_page(str(response.url)):
+                raise SessionExpired(f"Redirected to login page from {link}")
+
+            response.raise_for_status()
+            yield response.content
+
+    async def scrape_class_works_of_subject(
+        self, link: str
+    ) -> Optional[Dict[str, Optional[str]]]:
+        info_link = await self._get_parsed(
+            f"{site_prefix}{link}", parse_class_works_link
+        )
+
+        if info_link is None:
+            return None
+
+        class_works, download = await self._get_parsed(
+            f"{site_prefix}{info_link}", parse_class_work_info
+        )
+
+        if download is not None:
+            content_link, _ = download
+            class_works["file"] = f"{site_prefix}{content_link}"  # opened by open_file
+
+        return class_works
+
+    async def scrape_home_works_of_subject(
+        self, link: str
+    ) -> Optional[Dict[str, Optional[str]]]:
+        home_work = await self._get_parsed(f"{site_prefix}{link}", parse_home_work)
+
+        if home_work is None:
+            return None
+
+        home_works, modal_link, _ = home_work
+        home_works["file"] = modal_link  # opened by open_file
+
+        return home_works
+
+    async def scrape_home_works_of_subjects(
+        self, subjects: List[Dict[str, str]]
+    ) -> List[Optional[Dict[str, Optional[str]]]]:
+        """
+        Get the latest home work of every subject, subjects' pages are requested concurrently,
+        at most SUBJECT_SCRAPE_CONCURRENCY at once
+        :param subjects: Subjects as scrape_subjects returns them
+        :return: Home work of every subject (same as scrape_home_works_of_subject returns)
+        """
+        semaphore = asyncio.Semaphore(SUBJECT_SCRAPE_CONCURRENCY)
+
+        async def scrape(link: str) -> Optional[Dict[str, Optional[str]]]:
+            async with semaphore:
+                return await self.scrape_home_works_of_subject(link=link)
+
+        return list(
+            await asyncio.gather(*(scrape(subject["link"]) for subject in subjects))
+        )
+
+    async def scrape_all_home_works(self) -> List[Dict[str, Optional[str]]]:
+        """
+        Get the latest home work of every subject, see scrape_home_works_of_subjects
+        :return: Home works (same as scrape_home_works_of_subject returns) with "subject" name,
+            subjects without home works are skipped.
+        """
+        subjects = await self.scrape_subjects("home")
+        home_works = await self.scrape_home_works_of_subjects(subjects)
+
+        return [
+            {**home_work, "subject": subject["subject"]}
+            for subject, home_work in zip(subjects, home_works)
+            if home_work is not None
+        ]
+
+    async def _visit_lesson(
+        self, subject: Dict[str, str], semaphore: asyncio.Semaphore
+    ) -> LessonVisit:
+        """
+        Request remote lesson link, failure of one link does not affect others
+        :return: Copy of subject with "visited" flag and "error" description
+        """
+        visit: LessonVisit = {**subject, "visited": False, "error": None}
+
+        async with semaphore:
+            try:
+                await asyncio.wait_for(
+                    self._get(subject["link"]), timeout=LESSON_VISIT_TIMEOUT
+                )
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                visit["error"] = "timeout"
+            except aiohttp.ClientResponseError as e_info:
+                visit["error"] = f"HTTP {e_info.status}"
+            except aiohttp.ClientError as e_info:
+                visit["error"] = type(e_info).__name__
+            except Exception as e_info:  # SessionExpired, unexpected page etc.
+                logger.exception(f"Request of {subject['link']} failed")
+                visit["error"] = type(e_info).__name__
+            else:
+                visit["visited"] = True
+
+        logger.info(f"Requested {subject['link']} | {visit['error'] or 'ok'}")
+        return visit
+
+    async def go_to_lesson(
+        self, schedule: Optional[List[Dict[str, str]]] = None
+    ) -> List[LessonVisit]:
+        """
+        Request remote lesson links of today's lessons concurrently,
+        at most LESSON_VISIT_CONCURRENCY at once and LESSON_VISIT_TIMEOUT seconds each
+        :param schedule: Today's schedule, scraped if not passed
+        :return: Lessons with link, each has "visited" flag and "error" if it was not visited
+        """
+        if schedule is None:
+            schedule = await self.get_todays_schedule()
+
+        if schedule is None:
+            raise ValueError("No schedule")
+
+        semaphore = asyncio.Semaphore(LESSON_VISIT_CONCURRENCY)
+        return list(
+            await asyncio.gather(
+                *(
+                    self._visit_lesson(subject, semaphore)
+                    for subject in schedule
+                    if subject["link"] is not None
+                )
+            )
+        )
@@ -0,0 +1,150 @@
+import copy
+import hashlib
+import logging
+import re
+import time
+from collections import Counter
+
+from core.cache import TTLCache
+from settings import PAGE_CACHE_SIZE, PAGE_CACHE_STATS_INTERVAL, PAGE_CACHE_TTL
+
+from typing import (  # isort:skip
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+# Yii masks csrf token differently in every response, so it is not a part of page's content
+CSRF_VALUE_RE = re.compile(
+    rb'(name="(?:csrf-token|_csrf)"\s+(?:content|value)=")[^"]*"'
+)
+
+
+class Validator(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    digest: str
+
+
+def content_digest(content: bytes) -> str:
+    return hashlib.sha1(CSRF_VALUE_RE.sub(rb'\1"', content)).hexdigest()
+
+
+class PageCache:
+    """
+    Parsed pages by hash of their content, so unchanged page is not parsed again.
+    Validators (ETag, Last-Modified) of pages are kept per owner of pages (account,
+    not its session, which changes on every login) and sent back in conditional requests,
+    304 response is answered from cache too. Stats are logged every stats_interval seconds.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        maxsize: int,
+        stats_interval: float = PAGE_CACHE_STATS_INTERVAL,
+    ) -> None:
+        """
+        :param ttl: Lifetime of parsed page and validators in seconds
+        :param maxsize: Max count of parsed pages and of validators
+        :param stats_interval: Seconds between logs of stats, 0 disables them
+        """
+        self._validators: TTLCache[Validator] = TTLCache(ttl=ttl, maxsize=maxsize)
+        self._parsed: TTLCache[Tuple[Any]] = TTLCache(ttl=ttl, maxsize=maxsize)
+        self.stats: Counter = Counter()  # "hits", "misses" and "not_modified"
+        self.stats_interval = stats_interval
+        self._stats_logged = time.monotonic()
+
+    def _count(self, event: str) -> None:
+        self.stats[event] += 1
+
+        now = time.monotonic()
+        if self.stats_interval and now - self._stats_logged >= self.stats_interval:
+            self._stats_logged = now
+            logger.info(f"Page cache | {dict(self.stats)}")
+
+    def request_headers(self, owner: Optional[Hashable], url: str) -> Dict[str, str]:
+        """
+        :param owner: Stable identifier of account requesting page, e.g. its login
+        :param url: Url of page
+        :return: Conditional headers of request to page, empty if site gave no validators
+        """
+        if owner is None:
+            return {}
+
+        validator = self._validators.get((owner, url))
+        headers: Dict[str, str] = {}
+
+        if validator is not None and validator.etag is not None:
+            headers["If-None-Match"] = validator.etag
+        if validator is not None and validator.last_modified is not None:
+            headers["If-Modified-Since"] = validator.last_modified
+
+        return headers
+
+    def not_modified(
+        self, owner: Hashable, url: str, parser: Callable[..., Any], *args: Any
+    ) -> Tuple[bool, Any]:
+        """
+        Get parsed page after 304 response
+        :return: (True, parsed page) or (False, None) if parsed page is not in cache anymore
+        """
+        validator = self._validators.get((owner, url))
+        if validator is None:
+            return False, None
+
+        parsed = self._parsed.get((parser, args, validator.digest))
+        if parsed is None:
+            return False, None
+
+        self._count("not_modified")
+        return True, copy.deepcopy(parsed[0])
+
+    def parse(
+        self,
+        content: bytes,
+        parser: Callable[..., Any],
+        *args: Any,
+        owner: Optional[Hashable] = None,
+        url: Optional[str] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Any:
+        """
+        Parse page or take parsed page with the same content from cache
+        :param content: Page content
+        :param parser: Parser of page, called as parser(content, *args)
+        :param owner: Owner of page, validators are kept if it is passed with url
+        :param url: Url of page
+        :param headers: Response headers
+        :return: Copy of parsed page
+        """
+        digest = content_digest(content)
+
+        if owner is not None and url is not None:
+            headers = headers or {}
+            self._validators.set(
+                (owner, url),
+                Validator(headers.get("ETag"), headers.get("Last-Modified"), digest),
+            )
+
+        key = (parser, args, digest)
+        parsed = self._parsed.get(key)
+
+        if parsed is not None:
+            self._count("hits")
+        else:
+            self._count("misses")
+            parsed = (parser(content, *args),)
+            self._parsed.set(key, parsed)
+
+        return copy.deepcopy(parsed[0])
+
+
+page_cache = PageCache(ttl=PAGE_CACHE_TTL, maxsize=PAGE_CACHE_SIZE)
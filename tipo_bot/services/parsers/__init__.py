@@ -0,0 +1,31 @@
+"""
+Page parsers used by scrapers. Backend is selected by PARSER_BACKEND setting:
+"lxml" - lxml.html XPath, "bs4" - BeautifulSoup, slower fallback.
+"""
+from typing import Any, Dict
+
+from settings import PARSER_BACKEND
+
+from . import bs4_backend, lxml_backend
+from .base import ClassWorkInfo, HomeWorkInfo, site_prefix  # noqa: F401
+
+# Modules with the same parse_* functions
+BACKENDS: Dict[str, Any] = {
+    "bs4": bs4_backend,
+    "lxml": lxml_backend,
+}
+
+if PARSER_BACKEND not in BACKENDS:
+    raise ValueError(
+        f"Unknown PARSER_BACKEND {PARSER_BACKEND!r}, choose one of {', '.join(BACKENDS)}"
+    )
+
+backend = BACKENDS[PARSER_BACKEND]
+
+parse_csrf_token = backend.parse_csrf_token
+parse_todays_schedule = backend.parse_todays_schedule
+parse_week_schedule = backend.parse_week_schedule
+parse_subjects = backend.parse_subjects
+parse_class_works_link = backend.parse_class_works_link
+parse_class_work_info = backend.parse_class_work_info
+parse_home_work = backend.parse_home_work
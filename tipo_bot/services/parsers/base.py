@@ -0,0 +1,141 @@
+"""
+Backend independent part of parsers: backends only extract texts and attributes from page,
+dicts returned by scraper are built here.
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+from settings import TIPO_SITE_ROOT
+
+site_prefix = TIPO_SITE_ROOT
+
+SCHEDULE_CELL_KEYS = ("name", "subject", "lecture", "format")
+CLASS_WORK_INFO_KEYS = (
+    "id",
+    "subject",
+    "group",
+    "teacher",
+    "material",
+    "date",
+    "created_at",
+    "updated_at",
+)
+
+DISTANCE_LEARNING_RE = re.compile(r"Дистанционное обучение\s+(\D+)\s+")
+FILES_COUNT_RE = re.compile(r"\D+\(([\d]{1,})\)$")
+PASTE_RE = re.compile(r"(dpaste|paste)", re.I)
+
+ClassWorkInfo = Tuple[Dict[str, Optional[str]], Optional[Tuple[str, Optional[str]]]]
+HomeWorkInfo = Tuple[Dict[str, Optional[str]], Optional[str], Optional[str]]
+
+
+def build_schedule_entry(
+    time_text: str, info_texts: List[str], href: Optional[str]
+) -> Dict[str, Optional[str]]:
+    """
+    :param time_text: Text of first cell of row, e.g. "1 09:00-09:35"
+    :param info_texts: Texts of lesson's info divs
+    :param href: Lesson link's href or None if lesson has no link
+    """
+    schedule: Dict[str, Optional[str]] = {
+        "time": [time for time in time_text.split(" ") if len(time) > 4][0]
+    }
+
+    for dict_key, text in zip(SCHEDULE_CELL_KEYS, info_texts):
+        text = text.strip()
+        if "Дистанционное обучение" in text:
+            _text = DISTANCE_LEARNING_RE.match(text)
+            if _text is not None:
+                text = _text.group(1)
+
+        schedule[dict_key] = text
+
+    schedule["link"] = None
+    if href is not None:
+        schedule["link"] = site_prefix + href
+
+    return schedule
+
+
+def build_subject(title: str, href: Optional[str]) -> Dict[str, Optional[str]]:
+    return {"subject": re.sub(r"\d+", "", title).strip(), "link": href}
+
+
+def build_class_work(
+    desc: str, rows: List[Tuple[str, Optional[Tuple[str, Optional[str]]]]]
+) -> ClassWorkInfo:
+    """
+    :param desc: Description of class work
+    :param rows: Text and (href, download attribute) of link of every info table's row
+    :return: Class work dict and (relative link, filename) of material to download
+        or None if material is not a file.
+    """
+    download = None
+    class_works: Dict[str, Optional[str]] = {
+        "type": "file",
+        "file": None,
+        "filename": None,
+        "desc": desc,
+    }
+
+    for title, (text, link) in zip(CLASS_WORK_INFO_KEYS, rows):
+        if title == "material" and link is not None:
+            href, filename = link
+            if PASTE_RE.search(href) is not None:
+                class_works["type"] = "paste"
+                class_works["filename"] = href
+                class_works["file"] = href
+                continue
+
+            download = (href, filename)
+            class_works["filename"] = filename
+            continue
+
+        class_works[title] = text.strip()
+
+    return class_works, download
+
+
+def files_count(files_text: str) -> Optional[int]:
+    """
+    :param files_text: Text of home work's files cell, e.g. "Файлы (1)"
+    """
+    files_match = FILES_COUNT_RE.match(files_text.strip())
+    if files_match is None:
+        return None
+
+    return int(files_match.group(1))
+
+
+def build_home_work(
+    data_key: Optional[str],
+    td_texts: List[str],
+    file_href: Optional[str],
+    file_extension: Optional[str],
+) -> HomeWorkInfo:
+    """
+    :param data_key: Home work's id
+    :param td_texts: Texts of home work row's cells
+    :param file_href: Relative link of attached file
+    :param file_extension: Extension of attached file
+    :return: Home work dict, absolute link and filename of attached file
+    """
+    filename = None
+    modal_link = None
+
+    if file_href is not None:
+        modal_link = site_prefix + file_href
+        filename = f"{td_texts[2].strip()[:15]}.{file_extension}"
+
+    home_work = {
+        "data_key": data_key,
+        "name": td_texts[1].strip(),
+        "desc": td_texts[2].strip(),
+        "deadline": td_texts[3].strip(),
+        "teacher": td_texts[4].strip(),
+        "file": None,
+        "filename": filename,
+        "created_at": td_texts[6].strip(),
+    }
+
+    return home_work, modal_link, filename
@@ -0,0 +1,222 @@
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup as bs
+from bs4.element import Tag
+
+from .base import (  # isort:skip
+    SCHEDULE_CELL_KEYS,
+    ClassWorkInfo,
+    HomeWorkInfo,
+    build_class_work,
+    build_home_work,
+    build_schedule_entry,
+    build_subject,
+    files_count,
+)
+
+
+def parse_csrf_token(content: bytes) -> Optional[str]:
+    """
+    Get csrf token from page's meta tags
+    :param content: Html page content
+    :return: Csrf token or None
+    """
+    meta = bs(content, "lxml").find("meta", attrs={"name": "csrf-token"})
+    return meta.get("content", None) if meta is not None else None
+
+
+def _date_columns(head: Tag) -> List[Tuple[int, str]]:
+    """
+    :param head: thead of schedules table
+    :return: (column index, date) of every day in table
+    """
+    columns = []
+    for column, th in enumerate(head.find_all("th")):
+        date_span = th.find("span", attrs={"class": "text-muted"})
+        if date_span is not None:
+            columns.append((column, date_span.text.strip()))
+
+    return columns
+
+
+def _schedule_table(content: bytes) -> Tuple[Tag, List[List[Tag]]]:
+    """
+    :return: thead of schedules table and row x column matrix of its cells
+    """
+    soup = bs(content, "lxml")
+    schedules = soup.find("table", attrs={"id": "schedules"})
+
+    cells: List[List[Tag]] = [
+        tr.find_all("td", recursive=False)
+        for tr in schedules.find("tbody").find_all("tr", recursive=False)
+    ]
+    return schedules.find("thead"), cells
+
+
+def _parse_schedule_column(
+    cells: List[List[Tag]], column: int
+) -> List[Dict[str, Optional[str]]]:
+    subjects: List[Dict[str, Optional[str]]] = []
+
+    for row in cells:
+        if len(row) <= column:
+            continue
+
+        # First div wraps lesson's info and link
+        divs = row[column].find_all("div")
+        if len(divs) <= len(SCHEDULE_CELL_KEYS):  # empty cell or lesson without info
+            continue
+
+        _link = divs[0].find("a")
+        subjects.append(
+            build_schedule_entry(
+                time_text=row[0].text,
+                info_texts=[div.text for div in divs[1:]],
+                href=_link.get("href", "no_href") if _link is not None else None,
+            )
+        )
+
+    return subjects
+
+
+def parse_todays_schedule(
+    content: bytes, today_date: str
+) -> Optional[List[Dict[str, Optional[str]]]]:
+    """
+    Parse today's column of schedules table.
+    Table is walked once: row x column matrix of cells is built and only today's column is parsed.
+    :param content: Schedules page content
+    :param today_date: Date in format dd.mm.YYYY
+    :return objects: List of dicts which contains info about time and subject's remote lesson link.
+        {"time": "09:00", "link": "some_link"}.
+    """
+    head, cells = _schedule_table(content)
+
+    for column, date in _date_columns(head):
+        if date == today_date:
+            return _parse_schedule_column(cells, column)
+
+    return None
+
+
+def parse_week_schedule(content: bytes) -> Dict[str, List[Dict[str, Optional[str]]]]:
+    """
+    Parse every day of schedules table
+    :param content: Schedules page content
+    :return: Lists of lessons (same as parse_todays_schedule returns) by date in format dd.mm.YYYY
+    """
+    head, cells = _schedule_table(content)
+
+    return {
+        date: _parse_schedule_column(cells, column)
+        for column, date in _date_columns(head)
+    }
+
+
+def parse_subjects(content: bytes) -> List[Dict[str, Optional[str]]]:
+    """
+    Parse subjects list of home works or class works page
+    :param content: Page content
+    :return: List of dicts {"subject": "Math", "link": "/admin/..."}
+    """
+    soup = bs(content, "lxml")
+
+    list_group_flush = soup.find("div", attrs={"class": "list-group-flush"}).find_all(
+        "a"
+    )
+
+    return [
+        build_subject(
+            title=a_tag.find("h5", attrs={"class": "text-dark"}).text,
+            href=a_tag.get("href"),
+        )
+        for a_tag in list_group_flush
+    ]
+
+
+def parse_class_works_link(content: bytes) -> Optional[str]:
+    """
+    Get link to the latest class work's info page
+    :param content: Subject's class works page content
+    :return: Relative link or None if subject has no class works
+    """
+    soup = bs(content, "lxml")
+
+    table = soup.find("table", attrs={"class": "table-hover"}).find("tbody")
+    trs = table.find_all("tr")
+
+    if len(trs) == 1:
+        return None
+
+    tds = trs[0].find_all("td")
+    return tds[-1].find("a").get("href")
+
+
+def parse_class_work_info(content: bytes) -> ClassWorkInfo:
+    """
+    Parse class work's info page
+    :param content: Class work's info page content
+    :return: Class work dict and (relative link, filename) of material to download
+        or None if material is not a file.
+    """
+    info_soup = bs(content, "lxml")
+
+    card = info_soup.find("div", attrs={"class": "card"})
+    sub_cards = card.find_all("div", attrs={"class": "card-body"})
+    desc = "\n".join([element.text for element in sub_cards[-1].find_all("p")])
+
+    info_table = info_soup.find("table", attrs={"id": "w0"})
+    rows = []
+
+    for tr in info_table.find_all("tr"):
+        content_td = tr.find("td")
+        content_link = content_td.find("a")
+
+        link = None
+        if content_link is not None:
+            link = (content_link.get("href"), content_link.get("download"))
+
+        rows.append((content_td.text, link))
+
+    return build_class_work(desc=desc, rows=rows)
+
+
+def parse_home_work(content: bytes) -> Optional[HomeWorkInfo]:
+    """
+    Parse the latest home work of subject
+    :param content: Subject's home works page content
+    :return: Home work dict, absolute link and filename of attached file
+        or None if subject has no home works.
+    """
+    soup = bs(content, "lxml")
+
+    table = soup.find("table", attrs={"class": "table-hover"}).find("tbody")
+    current_tr = table.find_all("tr")[0]
+
+    data_key = current_tr.get("data-key")
+    tds = current_tr.find_all("td")
+
+    if len(tds) == 1:
+        return None
+
+    count = files_count(tds[5].text)
+    if count is None:
+        return None
+
+    file_href = None
+    file_extension = None
+    hw_link = soup.find("div", attrs={"id": f"modal-files-{data_key}"})
+
+    if hw_link is not None and count > 0:
+        _body = hw_link.find("div", attrs={"class": "modal-body"})
+        file_extension = (
+            hw_link.find("tbody").find_all("td")[1].text.strip().split(".")[-1]
+        )  # get extension of file
+        file_href = _body.find("a").get("href")
+
+    return build_home_work(
+        data_key=data_key,
+        td_texts=[td.text for td in tds],
+        file_href=file_href,
+        file_extension=file_extension,
+    )
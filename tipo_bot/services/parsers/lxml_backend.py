@@ -0,0 +1,253 @@
+"""
+lxml.html XPath implementation of parsers, skips building of BeautifulSoup tree.
+Returns the same values as bs4_backend.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from lxml.html import HtmlElement, HTMLParser, document_fromstring
+
+from .base import (  # isort:skip
+    SCHEDULE_CELL_KEYS,
+    ClassWorkInfo,
+    HomeWorkInfo,
+    build_class_work,
+    build_home_work,
+    build_schedule_entry,
+    build_subject,
+    files_count,
+)
+
+parser = HTMLParser(encoding="utf-8")
+
+
+def _document(content: bytes) -> HtmlElement:
+    return document_fromstring(content, parser=parser)
+
+
+def _first(elements: List[HtmlElement]) -> Optional[HtmlElement]:
+    return elements[0] if elements else None
+
+
+def _find(root: HtmlElement, xpath: str) -> HtmlElement:
+    """
+    First element matching xpath, page without it has unexpected layout
+    :raises ValueError: if there is no such element
+    """
+    element = _first(root.xpath(xpath))
+    if element is None:
+        raise ValueError(f"No element matches {xpath}")
+
+    return element
+
+
+def _has_class(name: str) -> str:
+    """
+    XPath predicate matching element with class `name` among others, like bs4's attrs={"class": name}
+    """
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def parse_csrf_token(content: bytes) -> Optional[str]:
+    """
+    Get csrf token from page's meta tags
+    :param content: Html page content
+    :return: Csrf token or None
+    """
+    meta = _first(_document(content).xpath("//meta[@name='csrf-token']"))
+    return meta.get("content", None) if meta is not None else None
+
+
+def _date_columns(head: HtmlElement) -> List[Tuple[int, str]]:
+    """
+    :param head: thead of schedules table
+    :return: (column index, date) of every day in table
+    """
+    columns = []
+    for column, th in enumerate(head.xpath(".//th")):
+        date_span = _first(th.xpath(f".//span[{_has_class('text-muted')}]"))
+        if date_span is not None:
+            columns.append((column, date_span.text_content().strip()))
+
+    return columns
+
+
+def _schedule_table(content: bytes) -> Tuple[HtmlElement, List[List[HtmlElement]]]:
+    """
+    :return: thead of schedules table and row x column matrix of its cells
+    """
+    schedules = _find(_document(content), "//table[@id='schedules']")
+
+    cells: List[List[HtmlElement]] = [
+        tr.xpath("./td") for tr in _find(schedules, ".//tbody").xpath("./tr")
+    ]
+    return _find(schedules, ".//thead"), cells
+
+
+def _parse_schedule_column(
+    cells: List[List[HtmlElement]], column: int
+) -> List[Dict[str, Optional[str]]]:
+    subjects: List[Dict[str, Optional[str]]] = []
+
+    for row in cells:
+        if len(row) <= column:
+            continue
+
+        # First div wraps lesson's info and link
+        divs = row[column].xpath(".//div")
+        if len(divs) <= len(SCHEDULE_CELL_KEYS):  # empty cell or lesson without info
+            continue
+
+        _link = _first(divs[0].xpath(".//a"))
+        subjects.append(
+            build_schedule_entry(
+                time_text=row[0].text_content(),
+                info_texts=[div.text_content() for div in divs[1:]],
+                href=_link.get("href", "no_href") if _link is not None else None,
+            )
+        )
+
+    return subjects
+
+
+def parse_todays_schedule(
+    content: bytes, today_date: str
+) -> Optional[List[Dict[str, Optional[str]]]]:
+    """
+    Parse today's column of schedules table
+    :param content: Schedules page content
+    :param today_date: Date in format dd.mm.YYYY
+    :return objects: List of dicts which contains info about time and subject's remote lesson link.
+        {"time": "09:00", "link": "some_link"}.
+    """
+    head, cells = _schedule_table(content)
+
+    for column, date in _date_columns(head):
+        if date == today_date:
+            return _parse_schedule_column(cells, column)
+
+    return None
+
+
+def parse_week_schedule(content: bytes) -> Dict[str, List[Dict[str, Optional[str]]]]:
+    """
+    Parse every day of schedules table
+    :param content: Schedules page content
+    :return: Lists of lessons (same as parse_todays_schedule returns) by date in format dd.mm.YYYY
+    """
+    head, cells = _schedule_table(content)
+
+    return {
+        date: _parse_schedule_column(cells, column)
+        for column, date in _date_columns(head)
+    }
+
+
+def parse_subjects(content: bytes) -> List[Dict[str, Optional[str]]]:
+    """
+    Parse subjects list of home works or class works page
+    :param content: Page content
+    :return: List of dicts {"subject": "Math", "link": "/admin/..."}
+    """
+    list_group_flush = _find(
+        _document(content), f"//div[{_has_class('list-group-flush')}]"
+    )
+
+    return [
+        build_subject(
+            title=_find(a_tag, f".//h5[{_has_class('text-dark')}]").text_content(),
+            href=a_tag.get("href"),
+        )
+        for a_tag in list_group_flush.xpath(".//a")
+    ]
+
+
+def parse_class_works_link(content: bytes) -> Optional[str]:
+    """
+    Get link to the latest class work's info page
+    :param content: Subject's class works page content
+    :return: Relative link or None if subject has no class works
+    """
+    table = _find(
+        _find(_document(content), f"//table[{_has_class('table-hover')}]"), ".//tbody"
+    )
+    trs = table.xpath(".//tr")
+
+    if len(trs) == 1:
+        return None
+
+    tds = trs[0].xpath(".//td")
+    return _find(tds[-1], ".//a").get("href")
+
+
+def parse_class_work_info(content: bytes) -> ClassWorkInfo:
+    """
+    Parse class work's info page
+    :param content: Class work's info page content
+    :return: Class work dict and (relative link, filename) of material to download
+        or None if material is not a file.
+    """
+    document = _document(content)
+
+    card = _find(document, f"//div[{_has_class('card')}]")
+    sub_cards = card.xpath(f".//div[{_has_class('card-body')}]")
+    desc = "\n".join(
+        [element.text_content() for element in sub_cards[-1].xpath(".//p")]
+    )
+
+    info_table = _find(document, "//table[@id='w0']")
+    rows = []
+
+    for tr in info_table.xpath(".//tr"):
+        content_td = _find(tr, ".//td")
+        content_link = _first(content_td.xpath(".//a"))
+
+        link = None
+        if content_link is not None:
+            link = (content_link.get("href"), content_link.get("download"))
+
+        rows.append((content_td.text_content(), link))
+
+    return build_class_work(desc=desc, rows=rows)
+
+
+def parse_home_work(content: bytes) -> Optional[HomeWorkInfo]:
+    """
+    Parse the latest home work of subject
+    :param content: Subject's home works page content
+    :return: Home work dict, absolute link and filename of attached file
+        or None if subject has no home works.
+    """
+    document = _document(content)
+
+    table = _find(_find(document, f"//table[{_has_class('table-hover')}]"), ".//tbody")
+    current_tr = table.xpath(".//tr")[0]
+
+    data_key = current_tr.get("data-key")
+    tds = current_tr.xpath(".//td")
+
+    if len(tds) == 1:
+        return None
+
+    count = files_count(tds[5].text_content())
+    if count is None:
+        return None
+
+    file_href = None
+    file_extension = None
+    hw_link = _first(document.xpath(f"//div[@id='modal-files-{data_key}']"))
+
+    if hw_link is not None and count > 0:
+        _body = _find(hw_link, f".//div[{_has_class('modal-body')}]")
+        file_extension = (
+            (_find(hw_link, ".//tbody").xpath(".//td")[1].text_content())
+            .strip()
+            .split(".")[-1]
+        )  # get extension of file
+        file_href = _find(_body, ".//a").get("href")
+
+    return build_home_work(
+        data_key=data_key,
+        td_texts=[td.text_content() for td in tds],
+        file_href=file_href,
+        file_extension=file_extension,
+    )
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+from typing import Dict, NamedTuple, Optional
+
+from aiohttp import ClientSession
+
+from core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+CLOSE_DELAY = 30  # seconds, lets in-flight requests of evicted session finish
+
+
+class CachedSession(NamedTuple):
+    session: ClientSession
+    credentials: Dict[str, str]
+
+
+class SessionCache:
+    """
+    Logged in zhambyltipo.kz sessions keyed by telegram_id
+    """
+
+    def __init__(self, ttl: float, maxsize: int) -> None:
+        """
+        :param ttl: Seconds after login when session is considered as expired
+        :param maxsize: Max count of cached sessions
+        """
+        self._cache: TTLCache[CachedSession] = TTLCache(
+            ttl=ttl, maxsize=maxsize, on_evict=self._close
+        )
+
+    def get(
+        self, telegram_id: int, credentials: Dict[str, str]
+    ) -> Optional[ClientSession]:
+        """
+        Get logged in session of user
+        :param telegram_id: User's telegram id
+        :param credentials: Current credentials of user, session logged in with other ones is dropped
+        :return: Session or None
+        """
+        cached = self._cache.get(telegram_id)
+        if cached is None:
+            return None
+
+        if cached.credentials != credentials:
+            self._cache.pop(telegram_id)
+            return None
+
+        return cached.session
+
+    def set(
+        self, telegram_id: int, credentials: Dict[str, str], session: ClientSession
+    ) -> None:
+        self._cache.set(telegram_id, CachedSession(session, dict(credentials)))
+
+    def invalidate(self, telegram_id: int) -> None:
+        if self._cache.pop(telegram_id) is not None:
+            logger.info(f"Session of {telegram_id} invalidated")
+
+    async def close(self) -> None:
+        """
+        Close all cached sessions immediately
+        """
+        cached_sessions = self._cache.values()
+        self._cache.on_evict = None
+        self._cache.clear()
+        self._cache.on_evict = self._close
+
+        for cached in cached_sessions:
+            await cached.session.close()
+
+    @staticmethod
+    def _close(cached: CachedSession) -> None:
+        loop = asyncio.get_event_loop()
+        loop.call_later(
+            CLOSE_DELAY, lambda: asyncio.ensure_future(cached.session.close())
+        )
@@ -0,0 +1,49 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from core.cache import TTLCache
+
+MAX_DEBOUNCED = 10000  # results kept for debounce
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first call runs, the others wait for
+    and share its result or exception. Result is also shared with calls made within debounce
+    seconds after it is ready. Result object is shared, callers must not modify it.
+    """
+
+    def __init__(self, debounce: float = 0) -> None:
+        """
+        :param debounce: Seconds result is reused after call completes
+        """
+        self.debounce = debounce
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._results: TTLCache[Tuple[Any]] = TTLCache(
+            ttl=debounce, maxsize=MAX_DEBOUNCED
+        )
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        :param key: Key of call, e.g. (telegram_id, operation, argument)
+        :param call: Makes awaitable of the call, not called if call is coalesced
+        :return: Result of call
+        """
+        result = self._results.get(key)
+        if result is not None:
+            return result[0]
+
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._complete(key, done))
+
+        # Cancelled waiter does not cancel the call for others
+        return await asyncio.shield(task)
+
+    def _complete(self, key: Hashable, task: "asyncio.Future[Any]") -> None:
+        self._calls.pop(key, None)
+
+        if self.debounce > 0 and not task.cancelled() and task.exception() is None:
+            self._results.set(key, (task.result(),))
@@ -1,10 +1,10 @@
 import json
 import logging
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Any, AsyncIterator, Dict
+from urllib.parse import urlparse
 
-import requests
-from bs4 import BeautifulSoup as bs
+import aiohttp
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +17,8 @@ HEADERS: Dict[str, str] = {
     ),
 }
 
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 
 def read_json_file(filename: str) -> dict:
     with open(filename, "r") as f:
@@ -24,19 +26,39 @@ def read_json_file(filename: str) -> dict:
     return data
 
 
-def get_csrf_token() -> Optional[str]:
-    with requests.Session() as session:
-        response: requests.Response = session.get(
-            url="https://zhambyltipo.kz/kk/site/login", headers=HEADERS
-        )
-        logger.info("Scraping csrf token")
-        soup = bs(response.content, "lxml")
-        csrf: Optional[str] = soup.find("meta", attrs={"name": "csrf-token"}).get(
-            "content", None
-        )
-
-    return csrf
+def is_login_page(url: str) -> bool:
+    """
+    Site redirects to login page if session is not logged in
+    """
+    return urlparse(url).path.endswith("/site/login")
 
 
 def get_today_date():
     return datetime.today().strftime("%d.%m.%Y")
+
+
+def deadline_of(text: str) -> datetime:
+    """
+    :param text: Home work's deadline, e.g. "20.10.2020 23:59"
+    :return: Deadline, datetime.max if text is not a date
+    """
+    for date_format in ("%d.%m.%Y %H:%M", "%d.%m.%Y"):
+        try:
+            return datetime.strptime(text.strip(), date_format)
+        except ValueError:
+            continue
+
+    return datetime.max
+
+
+async def hashed_chunks(
+    stream: aiohttp.StreamReader, digest: Any
+) -> AsyncIterator[bytes]:
+    """
+    Pass chunks of stream through, updating digest with each of them
+    :param stream: Body of response
+    :param digest: hashlib object, its hexdigest() is the content hash once stream is consumed
+    """
+    async for chunk in stream.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+        digest.update(chunk)
+        yield chunk
@@ -0,0 +1,42 @@
+"""
+Users are split between worker processes by telegram_id, see tipo_bot.workers
+"""
+from typing import Any, Dict, Optional
+
+worker_index = 0
+worker_count = 1
+
+
+def configure(index: int, count: int) -> None:
+    """
+    Set shard of this process, called by worker before it handles anything
+    """
+    global worker_index, worker_count
+    worker_index, worker_count = index, count
+
+
+def worker_of(telegram_id: int, count: int) -> int:
+    return telegram_id % count
+
+
+def is_local(telegram_id: int) -> bool:
+    """
+    Whether user is served by this process, background services skip users of other workers
+    """
+    return worker_of(telegram_id, worker_count) == worker_index
+
+
+def update_owner(update: Dict[str, Any]) -> Optional[int]:
+    """
+    :param update: Update as Telegram sends it
+    :return: Id of user who caused the update, or of chat if update has no user
+    """
+    for kind, payload in update.items():
+        if kind == "update_id" or not isinstance(payload, dict):
+            continue
+
+        owner = payload.get("from") or payload.get("user") or payload.get("chat")
+        if owner is not None:
+            return owner["id"]
+
+    return None
@@ -1,22 +1,75 @@
 import json
 import logging
-import os
-import re
-from typing import Dict, List, Optional, TypeVar, Union
+from typing import Dict, List, NamedTuple, Optional, TypeVar, Union
 
 from aiogram import Bot
 from aiogram.types import InlineKeyboardMarkup, ReplyKeyboardMarkup
-from requests import Session as requests_session
-from sqlalchemy.orm import Session
 
-from .database.conf import session
+from core.cache import TTLCache
+from core.custom_exceptions import SessionExpired
+
+from .database.conf import run_sync
 from .database.models import User
-from .services.scraper import Auth, SiteEvents
+from .database.repository import attachments, users
+from .services.async_scraper import AsyncAuth, AsyncSiteEvents, LessonVisit
+from .services.session_cache import SessionCache
+from .services.single_flight import SingleFlight
+
+from settings import (  # isort:skip
+    SCRAPE_DEBOUNCE,
+    SESSION_CACHE_SIZE,
+    SESSION_TTL,
+    USER_CACHE_SIZE,
+    USER_CACHE_TTL,
+)
+
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
-ls: Session
+
+
+class CachedUser(NamedTuple):
+    """
+    Snapshot of User row with decoded credentials
+    """
+
+    id: int
+    telegram_id: int
+    first_name: str
+    tipo_credentials: Optional[str]
+    credentials: Optional[Dict[str, str]]  # {"email": ..., "pwd": ...}
+    auto_attend: bool
+    notify_home_works: bool
+
+    @classmethod
+    def from_row(cls, user: User) -> "CachedUser":
+        return cls(
+            id=user.id,
+            telegram_id=user.telegram_id,
+            first_name=user.first_name,
+            tipo_credentials=user.tipo_credentials,
+            credentials=(
+                json.loads(user.tipo_credentials)
+                if user.tipo_credentials is not None
+                else None
+            ),
+            auto_attend=user.auto_attend,
+            notify_home_works=user.notify_home_works,
+        )
+
+
+# Read-through cache of users by telegram_id, writes of user drop its entry
+user_cache: TTLCache[CachedUser] = TTLCache(ttl=USER_CACHE_TTL, maxsize=USER_CACHE_SIZE)
+user_loads = SingleFlight()
+
+# Repeated taps of user share scrapes keyed by (telegram_id, operation, argument)
+scrapes = SingleFlight(debounce=SCRAPE_DEBOUNCE)
+logins = SingleFlight()
+
+MESSAGE_LIMIT = 4096  # characters of Telegram message
+
+tipo_sessions = SessionCache(ttl=SESSION_TTL, maxsize=SESSION_CACHE_SIZE)
 
 
 def validate_creds(creds_string: str) -> bool:
@@ -24,71 +77,142 @@ def validate_creds(creds_string: str) -> bool:
     return True
 
 
-async def log_in_tipo_account(email: str, pwd: str) -> Optional[requests_session]:
-    auth = Auth()
-    return auth.login(username=email, password=pwd)
+def split_message(parts: List[str], limit: int = MESSAGE_LIMIT) -> List[str]:
+    """
+    Join parts into as few messages as Telegram allows, part is never split
+    unless it is longer than limit itself
+    """
+    messages = [""]
+
+    for part in parts:
+        if messages[-1] and len(messages[-1]) + len(part) > limit:
+            messages.append("")
+        messages[-1] += part
+
+    return [
+        message[start : start + limit]
+        for message in messages
+        for start in range(0, max(len(message), 1), limit)
+    ]
 
 
-async def get_or_create_user(telegram_id: int, first_name: str) -> User:
-    ls = session()
-    user: List[User]
+async def log_in_tipo_account(email: str, pwd: str) -> Optional[AsyncSiteEvents]:
+    auth = AsyncAuth()
+    _session = await auth.login(username=email, password=pwd)
 
-    user = ls.query(User).filter(User.telegram_id == telegram_id).all()
+    if _session is None:
+        return None
+
+    landing_url, landing_content = auth.landing_page
+    return AsyncSiteEvents(
+        login_session=_session, pages={landing_url: landing_content}, owner=email
+    )
 
-    if len(user) > 0:
-        return user[0]
 
-    ls.add(User(telegram_id=telegram_id, first_name=first_name))
-    ls.commit()
-    user = ls.query(User).filter(User.telegram_id == telegram_id).all()
+async def get_or_create_user(telegram_id: int, first_name: str) -> CachedUser:
+    """
+    Get user from user_cache, database is queried on cache miss only
+    """
+    user = user_cache.get(telegram_id)
+    if user is not None:
+        return user
+
+    async def load() -> CachedUser:
+        row = await run_sync(
+            users.get_or_create, telegram_id=telegram_id, first_name=first_name
+        )
+        loaded = CachedUser.from_row(row)
+        user_cache.set(telegram_id, loaded)
+        return loaded
 
-    return user[0]
+    return await user_loads.do(telegram_id, load)
 
 
 async def update_users_tipo_creds(
     telegram_id: int, credentials: Dict[str, str]
 ) -> bool:
-    ls = session()
+    try:
+        await run_sync(
+            users.update_credentials, telegram_id=telegram_id, credentials=credentials
+        )
+        user_cache.pop(telegram_id)
+        return True
+    except Exception as e_info:
+        logger.info(e_info)
+        return False
 
+
+async def set_user_flag(telegram_id: int, column: str, enabled: bool) -> bool:
+    """
+    :param column: Boolean column of User, "auto_attend" or "notify_home_works"
+    """
     try:
-        ls.query(User).filter(User.telegram_id == telegram_id).update(
-            {User.tipo_credentials: json.dumps(credentials)}
+        await run_sync(
+            users.set_flag, telegram_id=telegram_id, column=column, enabled=enabled
         )
-        ls.commit()
+        user_cache.pop(telegram_id)
         return True
     except Exception as e_info:
         logger.info(e_info)
         return False
 
 
+async def get_flagged_users(column: str) -> List[CachedUser]:
+    """
+    :param column: Boolean column of User, "auto_attend" or "notify_home_works"
+    :return: Users with credentials who opted in
+    """
+    return [CachedUser.from_row(user) for user in await run_sync(users.flagged, column)]
+
+
+async def get_attachment_file_id(
+    url: str, version: Optional[str] = None
+) -> Optional[str]:
+    """
+    :param url: Absolute link of attached file
+    :param version: Version of file at url, e.g. updated_at of class work
+    :return: Telegram file_id of this version of file uploaded before or None
+    """
+    return await run_sync(attachments.get_file_id, url, version)
+
+
+async def save_attachment(
+    url: str, content_hash: str, file_id: str, version: Optional[str] = None
+) -> None:
+    """
+    Remember file_id Telegram returned for uploaded file
+    :param url: Absolute link of attached file
+    :param content_hash: sha256 of file
+    :param file_id: Telegram file_id of uploaded document
+    :param version: Version of file at url
+    """
+    try:
+        await run_sync(
+            attachments.save,
+            url=url,
+            content_hash=content_hash,
+            file_id=file_id,
+            version=version,
+        )
+    except Exception as e_info:
+        logger.info(e_info)
+
+
+async def forget_attachment(file_id: str) -> None:
+    """
+    Drop file_id rejected by Telegram from every url it was saved for
+    """
+    await run_sync(attachments.delete_file_id, file_id)
+
+
 async def check_for_session(
     bot: Bot,
-    user: User,
+    user: CachedUser,
     buttons: Union[InlineKeyboardMarkup, ReplyKeyboardMarkup],
     telegram_id: int,
-) -> Optional[requests_session]:
-
-    _session = None
-    if user.tipo_credentials is not None:
-        creds = json.loads(user.tipo_credentials)
-        _session = await log_in_tipo_account(email=creds["email"], pwd=creds["pwd"])
-
-        if _session is None:
-            return None
-
-        # Check for valid
-        try:
-            site_events = SiteEvents(login_session=_session)
-            site_events.get_todays_schedule()
-        except AttributeError:
-            await bot.send_message(
-                telegram_id,
-                "Account has incorrect TIPO credentials...",
-                reply_markup=buttons,
-            )
-            return None
-
-    elif user.tipo_credentials is None:
+) -> Optional[AsyncSiteEvents]:
+
+    if user.credentials is None:
         await bot.send_message(
             telegram_id,
             "You have not inserted account credentials",
@@ -96,8 +220,78 @@ async def check_for_session(
         )
         return None
 
-    return _session
+    site_events = await get_site_events(
+        telegram_id=telegram_id, credentials=user.credentials
+    )
+
+    if site_events is None:
+        await bot.send_message(
+            telegram_id,
+            "Account has incorrect TIPO credentials...",
+            reply_markup=buttons,
+        )
+        return None
+
+    return site_events
+
+
+async def visit_lessons(
+    telegram_id: int,
+    site_events: AsyncSiteEvents,
+    schedule: Optional[List[Dict[str, str]]] = None,
+) -> List[LessonVisit]:
+    """
+    Visit today's lessons of user, see AsyncSiteEvents.go_to_lesson.
+    Cached session of user is dropped if a lesson link reports it expired,
+    so the next request logs in again.
+    """
+    visits = await site_events.go_to_lesson(schedule=schedule)
+
+    if any(visit["error"] == SessionExpired.__name__ for visit in visits):
+        tipo_sessions.invalidate(telegram_id)
+
+    return visits
+
+
+async def get_site_events(
+    telegram_id: int, credentials: Dict[str, str]
+) -> Optional[AsyncSiteEvents]:
+    """
+    Get site events of user's cached session or log in
+    :param telegram_id: User's telegram id
+    :param credentials: {"email": ..., "pwd": ...}
+    :return: Logged in site events or None if credentials are incorrect
+    """
+    _session = tipo_sessions.get(telegram_id, credentials)
+    if _session is not None:
+        return AsyncSiteEvents(login_session=_session, owner=credentials["email"])
+
+    # Login fails with incorrect credentials, so no extra page is needed to check them
+    async def login() -> Optional[AsyncSiteEvents]:
+        site_events = await log_in_tipo_account(
+            email=credentials["email"], pwd=credentials["pwd"]
+        )
+
+        if site_events is not None:
+            tipo_sessions.set(telegram_id, credentials, site_events.login_session)
+
+        return site_events
+
+    return await logins.do(
+        (telegram_id, credentials["email"], credentials["pwd"]), login
+    )
 
 
-def remove_file_from_storage(path: str) -> None:
-    os.remove(path)
+async def get_week_schedule(
+    telegram_id: int, site_events: AsyncSiteEvents
+) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Get user's schedule of current week. Schedule page is requested every time, so changes
+    of the schedule are seen at once, request is conditional and unchanged page is not parsed again.
+    :param telegram_id: User's telegram id
+    :param site_events: Logged in site events of user
+    :return: Lists of lessons by date in format dd.mm.YYYY
+    """
+    return await scrapes.do(
+        (telegram_id, "week_schedule", None), site_events.get_week_schedule
+    )
@@ -0,0 +1,112 @@
+"""
+Webhook mode: Telegram posts updates to aiohttp server instead of being polled
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+from aiogram import Dispatcher
+from aiogram.utils import executor
+from aiohttp import web
+
+from settings import (  # isort:skip
+    WEBAPP_HOST,
+    WEBAPP_PORT,
+    WEBHOOK_DRAIN_TIMEOUT,
+    WEBHOOK_HOST,
+    WEBHOOK_MAX_UPDATES,
+    WEBHOOK_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+RETRY_AFTER = "5"  # seconds, Telegram resends refused update later
+
+Hook = Callable[[Dispatcher], Awaitable[None]]
+
+
+class UpdateLimiter:
+    """
+    aiohttp middleware handling at most limit updates at once, others wait for their turn.
+    After drain starts new updates are refused with 503, Telegram delivers them again later.
+    """
+
+    def __init__(self, limit: int = WEBHOOK_MAX_UPDATES) -> None:
+        self.limit = limit
+        self.in_flight = 0
+        self.closing = False
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._idle: Optional[asyncio.Event] = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:  # created in running loop
+            self._semaphore = asyncio.Semaphore(self.limit)
+        return self._semaphore
+
+    @property
+    def idle(self) -> asyncio.Event:
+        if self._idle is None:
+            self._idle = asyncio.Event()
+            self._idle.set()
+        return self._idle
+
+    @web.middleware
+    async def middleware(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        if self.closing:
+            raise web.HTTPServiceUnavailable(headers={"Retry-After": RETRY_AFTER})
+
+        self.in_flight += 1
+        self.idle.clear()
+        try:
+            async with self.semaphore:
+                return await handler(request)
+        finally:
+            self.in_flight -= 1
+            if self.in_flight == 0:
+                self.idle.set()
+
+    async def drain(self, timeout: float = WEBHOOK_DRAIN_TIMEOUT) -> None:
+        """
+        Refuse new updates and wait until updates in flight are handled
+        :param timeout: Longest wait in seconds
+        """
+        self.closing = True
+        logger.info(f"Draining {self.in_flight} updates")
+
+        try:
+            await asyncio.wait_for(self.idle.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{self.in_flight} updates are not handled in {timeout} s")
+
+
+def start_webhook(dp: Dispatcher, on_startup: Hook, on_shutdown: Hook) -> None:
+    """
+    Register webhook and serve updates until the process is stopped.
+    Webhook is kept on shutdown, Telegram keeps updates until the bot is back.
+    """
+    limiter = UpdateLimiter()
+
+    async def on_webhook_startup(dispatcher: Dispatcher) -> None:
+        await dispatcher.bot.set_webhook(
+            f"{WEBHOOK_HOST.rstrip('/')}{WEBHOOK_PATH}", max_connections=limiter.limit
+        )
+        await on_startup(dispatcher)
+
+    async def on_webhook_shutdown(dispatcher: Dispatcher) -> None:
+        await limiter.drain()
+        await on_shutdown(dispatcher)
+
+    webhook_executor = executor.set_webhook(
+        dp,
+        webhook_path=WEBHOOK_PATH,
+        on_startup=on_webhook_startup,
+        on_shutdown=on_webhook_shutdown,
+        skip_updates=False,
+        web_app=web.Application(middlewares=[limiter.middleware]),
+    )
+    webhook_executor.run_app(host=WEBAPP_HOST, port=WEBAPP_PORT)
@@ -0,0 +1,230 @@
+"""
+Supervisor mode: one process gets updates and worker processes handle them.
+Update goes to worker by id of its user, so updates and FSM state of a user
+are always in one worker and parsing of pages is spread over all cores.
+"""
+import asyncio
+import functools
+import logging
+import logging.config
+import multiprocessing
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from aiogram import Bot, Dispatcher, types
+from aiohttp import web
+
+from . import sharding
+
+from settings import (  # isort:skip
+    BOT_API_TOKEN,
+    WEBAPP_HOST,
+    WEBAPP_PORT,
+    WEBHOOK_DRAIN_TIMEOUT,
+    WEBHOOK_HOST,
+    WEBHOOK_MAX_UPDATES,
+    WEBHOOK_PATH,
+    WORKER_MAX_UPDATES,
+)
+
+
+logger = logging.getLogger(__name__)
+
+POLLING_TIMEOUT = 20  # seconds of getUpdates long polling
+STOP = None  # put to queue of worker to stop it
+
+Update = Dict[str, Any]
+
+
+class UpdateRouter:
+    """
+    Puts updates to queues of workers, updates without user go to the first worker
+    """
+
+    def __init__(self, queues: List[multiprocessing.Queue]) -> None:
+        self.queues = queues
+
+    def route(self, update: Update) -> int:
+        """
+        :return: Index of worker handling the update
+        """
+        owner = sharding.update_owner(update)
+        return sharding.worker_of(owner, len(self.queues)) if owner is not None else 0
+
+    def put(self, update: Update) -> None:
+        self.queues[self.route(update)].put(update)
+
+
+async def handle_updates(
+    dp: Dispatcher, updates: multiprocessing.Queue, limit: int = WORKER_MAX_UPDATES
+) -> None:
+    """
+    Handle updates of queue until STOP, at most limit at once.
+    Updates of one user are handled one after another in order of arrival.
+    """
+    loop = asyncio.get_event_loop()
+    semaphore = asyncio.Semaphore(limit)
+    last_of_user: Dict[Optional[int], asyncio.Future] = {}
+
+    async def handle(update: Update, previous: Optional[asyncio.Future]) -> None:
+        if previous is not None:
+            await asyncio.wait([previous])
+
+        async with semaphore:
+            try:
+                await dp.process_update(types.Update(**update))
+            except Exception:
+                logger.exception(f"Update {update.get('update_id')} is not handled")
+
+    def forget(owner: Optional[int], task: asyncio.Future) -> None:
+        if last_of_user.get(owner) is task:
+            del last_of_user[owner]
+
+    # Queue.get blocks, it is called by the only thread of reader
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="updates") as reader:
+        while True:
+            update = await loop.run_in_executor(reader, updates.get)
+            if update is STOP:
+                break
+
+            owner = sharding.update_owner(update)
+            task = asyncio.ensure_future(handle(update, last_of_user.get(owner)))
+            task.add_done_callback(functools.partial(forget, owner))
+            last_of_user[owner] = task
+
+    if last_of_user:
+        logger.info(f"Finishing updates of {len(last_of_user)} users")
+        await asyncio.wait(list(last_of_user.values()))
+
+
+def run_worker(
+    index: int,
+    count: int,
+    updates: multiprocessing.Queue,
+    logging_config: Optional[dict],
+) -> None:
+    """
+    Entry point of worker process
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # stopped by supervisor with STOP
+    if logging_config is not None:
+        logging.config.dictConfig(logging_config)
+
+    sharding.configure(index, count)
+    from .bot import dp, on_shutdown, on_startup
+
+    async def serve() -> None:
+        Dispatcher.set_current(dp)
+        Bot.set_current(dp.bot)
+
+        await on_startup(dp)
+        try:
+            await handle_updates(dp, updates)
+        finally:
+            await on_shutdown(dp)
+            await dp.storage.close()
+            await dp.storage.wait_closed()
+            await dp.bot.close()
+
+    logger.info(f"Worker {index} of {count} started")
+    asyncio.get_event_loop().run_until_complete(serve())
+
+
+async def poll_updates(bot: Bot, router: UpdateRouter) -> None:
+    """
+    Get updates by long polling, updates sent while bot was off are skipped
+    """
+    await bot.delete_webhook()
+    skipped = await bot.get_updates(offset=-1, timeout=1)
+    offset = skipped[-1].update_id + 1 if skipped else None
+
+    while True:
+        try:
+            updates = await bot.get_updates(offset=offset, timeout=POLLING_TIMEOUT)
+        except Exception:
+            logger.exception("Updates are not received")
+            await asyncio.sleep(1)
+            continue
+
+        for update in updates:
+            router.put(update.to_python())
+            offset = update.update_id + 1
+
+
+def make_webhook_app(bot: Bot, router: UpdateRouter) -> web.Application:
+    """
+    Updates are answered right after they are queued, workers reply by Bot API requests
+    """
+
+    async def receive(request: web.Request) -> web.Response:
+        router.put(await request.json())
+        return web.Response()
+
+    async def register(app: web.Application) -> None:
+        await bot.set_webhook(
+            f"{WEBHOOK_HOST.rstrip('/')}{WEBHOOK_PATH}",
+            max_connections=WEBHOOK_MAX_UPDATES,
+        )
+
+    async def close(app: web.Application) -> None:
+        await bot.close()
+
+    app = web.Application()
+    app.router.add_post(WEBHOOK_PATH, receive)
+    app.on_startup.append(register)
+    app.on_cleanup.append(close)
+    return app
+
+
+def start_supervisor(
+    count: int, mode: str, logging_config: Optional[dict] = None
+) -> None:
+    """
+    Start count workers and give them updates got by polling or webhook until stopped
+    :param mode: "polling" or "webhook"
+    :param logging_config: dictConfig of workers' logging
+    """
+    # Workers do not inherit event loop, sessions and connections of supervisor
+    context = multiprocessing.get_context("spawn")
+    queues = [context.Queue() for _ in range(count)]
+    workers = [
+        context.Process(
+            target=run_worker,
+            args=(index, count, queue, logging_config),
+            name=f"worker-{index}",
+        )
+        for index, queue in enumerate(queues)
+    ]
+    for worker in workers:
+        worker.start()
+
+    def terminate(signum: int, frame: Any) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, terminate)
+
+    bot = Bot(token=BOT_API_TOKEN)
+    router = UpdateRouter(queues)
+    loop = asyncio.get_event_loop()
+    try:
+        if mode == "webhook":
+            web.run_app(
+                make_webhook_app(bot, router), host=WEBAPP_HOST, port=WEBAPP_PORT
+            )
+        else:
+            loop.run_until_complete(poll_updates(bot, router))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logger.info(f"Stopping {count} workers")
+        for queue in queues:
+            queue.put(STOP)
+        for worker in workers:
+            worker.join(timeout=WEBHOOK_DRAIN_TIMEOUT)
+            if worker.is_alive():
+                logger.warning(f"{worker.name} is not stopped in time, terminating")
+                worker.terminate()
+
+        if mode != "webhook":
+            loop.run_until_complete(bot.close())